@@ -0,0 +1,523 @@
+import os
+import re
+import json
+import asyncio
+import itertools
+import urllib.request
+from dotenv import load_dotenv
+
+from selenium.webdriver.common.keys import Keys
+
+from autoNavAndFill import (
+    UNRANKED_URL,
+    GAME_URL,
+    HIGHLIGHT_SCRIPT,
+    EDITOR_BUFFER_SCRIPT,
+    BeatCodeAutomation,
+)
+from gamePage import (
+    PROBLEM_TITLE_SELECTOR,
+    PROBLEM_CONTAINER_SELECTOR,
+    EDITOR_SELECTOR,
+    SUBMIT_BUTTON_SELECTOR,
+    NEXT_QUESTION_SELECTOR,
+    WINNING_STATE_SELECTOR,
+    TEST_RESULT_SELECTOR,
+)
+from keystrokePlanner import KeystrokePlanner
+
+try:
+    import websockets  # Optional, only needed for the async backend
+except ImportError:
+    websockets = None
+
+
+# Pushes page events to Python through the Runtime binding instead of being polled.
+# An event fires whenever a watched element appears, is replaced or changes its text,
+# so the same "Next question" button or verdict fires again on every problem.
+# %s: json list of [selector, event type] pairs
+PAGE_EVENTS_SCRIPT = """
+(() => {
+    if (window.__beatcodeObserver) return;
+    const watched = %s;
+    const last = new Map();
+    const check = () => {
+        for (const [selector, type] of watched) {
+            const element = document.querySelector(selector);
+            if (!element) {
+                last.delete(type);
+                continue;
+            }
+            const text = element.innerText;
+            const previous = last.get(type);
+            if (previous && previous.element === element && previous.text === text) continue;
+            last.set(type, {element: element, text: text});
+            window.beatcodeEvent(JSON.stringify({type: type, text: text}));
+        }
+    };
+    window.__beatcodeObserver = new MutationObserver(check);
+    window.__beatcodeObserver.observe(document.documentElement, {
+        childList: true,
+        subtree: true,
+        characterData: true,
+    });
+    check();
+})();
+"""
+
+# Selenium key codepoints -> CDP (key, code, windowsVirtualKeyCode, text)
+CDP_KEYS = {
+    Keys.BACKSPACE: ("Backspace", "Backspace", 8, ""),
+    Keys.DELETE: ("Delete", "Delete", 46, ""),
+    Keys.RETURN: ("Enter", "Enter", 13, "\r"),
+    Keys.ENTER: ("Enter", "Enter", 13, "\r"),
+    Keys.SPACE: (" ", "Space", 32, " "),
+    Keys.HOME: ("Home", "Home", 36, ""),
+    Keys.END: ("End", "End", 35, ""),
+    Keys.TAB: ("Tab", "Tab", 9, "\t"),
+}
+CDP_MODIFIERS = {Keys.ALT: 1, Keys.CONTROL: 2, Keys.COMMAND: 4, Keys.SHIFT: 8}
+
+# US layout punctuation -> (code, windowsVirtualKeyCode, unshifted, shifted). Using
+# ord() instead would send "(" as VK 40 (Down) and "." as VK 46 (Delete).
+US_PUNCTUATION_KEYS = (
+    ("Semicolon", 186, ";", ":"),
+    ("Equal", 187, "=", "+"),
+    ("Comma", 188, ",", "<"),
+    ("Minus", 189, "-", "_"),
+    ("Period", 190, ".", ">"),
+    ("Slash", 191, "/", "?"),
+    ("Backquote", 192, "`", "~"),
+    ("BracketLeft", 219, "[", "{"),
+    ("Backslash", 220, "\\", "|"),
+    ("BracketRight", 221, "]", "}"),
+    ("Quote", 222, "'", '"'),
+)
+SHIFTED_DIGITS = ")!@#$%^&*("
+
+# Editing commands a real keystroke would trigger; synthetic events need them spelled out
+CDP_COMMANDS = {
+    ("a", CDP_MODIFIERS[Keys.CONTROL]): ["selectAll"],
+    ("Backspace", CDP_MODIFIERS[Keys.CONTROL]): ["deleteWordBackward"],
+    ("Delete", CDP_MODIFIERS[Keys.CONTROL]): ["deleteWordForward"],
+}
+
+
+def us_layout_key(char):
+    """Return (code, windowsVirtualKeyCode, shifted) of a character on a US keyboard.
+
+    Characters the layout does not have get an empty code and key code 0, which
+    Chrome types from the event text alone.
+    """
+    if "a" <= char <= "z":
+        return f"Key{char.upper()}", ord(char.upper()), False
+    if "A" <= char <= "Z":
+        return f"Key{char}", ord(char), True
+    if char == " ":
+        return "Space", 32, False
+    if "0" <= char <= "9":
+        return f"Digit{char}", ord(char), False
+    if char in SHIFTED_DIGITS:
+        digit = str(SHIFTED_DIGITS.index(char))
+        return f"Digit{digit}", ord(digit), True
+    for code, key_code, unshifted, shifted in US_PUNCTUATION_KEYS:
+        if char == unshifted:
+            return code, key_code, False
+        if char == shifted:
+            return code, key_code, True
+    return "", 0, False
+
+
+class CDPConnection:
+    def __init__(self, websocket_url):
+        """
+        One websocket to the browser, multiplexing every attached tab (flat sessions).
+
+        :param websocket_url: The browser's webSocketDebuggerUrl.
+        """
+        if websockets is None:
+            raise ImportError("The async backend needs `pip install websockets`.")
+        self.websocket_url = websocket_url
+        self.socket = None
+        self.ids = itertools.count(1)
+        self.pending = {}
+        self.listeners = {}
+        self.reader = None
+
+    @classmethod
+    async def from_debugger_address(cls, debugger_address):
+        """Connect to a Chrome started with --remote-debugging-port ("host:port")."""
+        version = await asyncio.to_thread(
+            lambda: json.load(
+                urllib.request.urlopen(f"http://{debugger_address}/json/version")
+            )
+        )
+        connection = cls(version["webSocketDebuggerUrl"])
+        await connection.connect()
+        return connection
+
+    async def connect(self):
+        self.socket = await websockets.connect(self.websocket_url, max_size=None)
+        self.reader = asyncio.create_task(self.read_messages())
+
+    async def read_messages(self):
+        """Resolve command futures and dispatch events as they arrive."""
+        async for raw in self.socket:
+            message = json.loads(raw)
+            if "id" in message:
+                future = self.pending.pop(message["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(RuntimeError(message["error"].get("message")))
+                else:
+                    future.set_result(message.get("result", {}))
+                continue
+            for callback in self.listeners.get(
+                (message.get("sessionId"), message.get("method")), []
+            ):
+                callback(message.get("params", {}))
+
+    async def send(self, method, params=None, session_id=None):
+        """Send one CDP command and wait for its result."""
+        message_id = next(self.ids)
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self.pending[message_id] = future
+        await self.socket.send(json.dumps(message))
+        return await future
+
+    def on(self, method, callback, session_id=None):
+        """Call `callback(params)` for every `method` event of a session."""
+        self.listeners.setdefault((session_id, method), []).append(callback)
+
+    async def close(self):
+        if self.reader:
+            self.reader.cancel()
+        if self.socket:
+            await self.socket.close()
+
+
+class AsyncBeatCodeTab:
+    def __init__(self, connection, session_id, planner=None):
+        """
+        Async counterpart of BeatCodeAutomation driving one tab over CDP.
+
+        :param connection: The shared CDPConnection.
+        :param session_id: The flat session id of the attached tab.
+        :param planner: KeystrokePlanner used for the humanlike typing.
+        """
+        self.connection = connection
+        self.session_id = session_id
+        self.planner = planner or KeystrokePlanner()
+        self.events = asyncio.Queue()
+        self.current_problem = None
+
+    @classmethod
+    async def open(cls, connection, url="about:blank", planner=None):
+        """Create a new tab, attach to it and subscribe to its page events."""
+        target = await connection.send("Target.createTarget", {"url": url})
+        attached = await connection.send(
+            "Target.attachToTarget", {"targetId": target["targetId"], "flatten": True}
+        )
+        tab = cls(connection, attached["sessionId"], planner)
+        await tab.enable_events()
+        return tab
+
+    async def send(self, method, params=None):
+        return await self.connection.send(method, params, self.session_id)
+
+    async def enable_events(self):
+        """Push winning/passed/verdict changes to self.events via a Runtime binding."""
+        watched = json.dumps(
+            [
+                [WINNING_STATE_SELECTOR, "won"],
+                [NEXT_QUESTION_SELECTOR, "passed"],
+                [TEST_RESULT_SELECTOR, "verdict"],
+                [PROBLEM_TITLE_SELECTOR, "problem"],
+            ]
+        )
+        self.connection.on(
+            "Runtime.bindingCalled",
+            lambda params: self.events.put_nowait(json.loads(params["payload"])),
+            self.session_id,
+        )
+        await self.send("Page.enable")
+        await self.send("Runtime.enable")
+        await self.send("Runtime.addBinding", {"name": "beatcodeEvent"})
+        await self.send(
+            "Page.addScriptToEvaluateOnNewDocument",
+            {"source": PAGE_EVENTS_SCRIPT % watched, "runImmediately": True},
+        )
+
+    async def evaluate(self, expression, await_promise=False):
+        """Evaluate a JS expression in the page and return its value."""
+        result = await self.send(
+            "Runtime.evaluate",
+            {
+                "expression": expression,
+                "returnByValue": True,
+                "awaitPromise": await_promise,
+            },
+        )
+        return result.get("result", {}).get("value")
+
+    async def call_on(self, selector, script, *args):
+        """Run a Selenium-style script (arguments[0] is the element) over CDP."""
+        element = await self.send(
+            "Runtime.evaluate", {"expression": f"document.querySelector({json.dumps(selector)})"}
+        )
+        object_id = element["result"].get("objectId")
+        if object_id is None:
+            raise RuntimeError(f"No element matches {selector}")
+        result = await self.send(
+            "Runtime.callFunctionOn",
+            {
+                "objectId": object_id,
+                "functionDeclaration": "function() {" + script + "}",
+                "arguments": [{"objectId": object_id}] + [{"value": arg} for arg in args],
+                "returnByValue": True,
+            },
+        )
+        return result.get("result", {}).get("value")
+
+    async def wait_for(self, expression, timeout=30, interval=0.05):
+        """Wait until a JS expression is truthy. Polls over the websocket, no HTTP."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            value = await self.evaluate(expression)
+            if value:
+                return value
+            await asyncio.sleep(interval)
+        return None
+
+    async def navigate(self, url):
+        await self.send("Page.navigate", {"url": url})
+
+    async def click(self, selector):
+        return await self.evaluate(
+            f"(() => {{ const el = document.querySelector({json.dumps(selector)});"
+            " if (el) el.click(); return !!el; })()"
+        )
+
+    async def press(self, key, modifier=None):
+        """Press one key (a character or a Selenium Keys codepoint)."""
+        modifiers = CDP_MODIFIERS.get(modifier, 0)
+        if key in CDP_KEYS:
+            name, code, key_code, text = CDP_KEYS[key]
+            shifted = False
+        else:
+            name, text = key, key
+            code, key_code, shifted = us_layout_key(key) if len(key) == 1 else ("", 0, False)
+        if modifiers:
+            text = ""
+        down = {
+            "type": "keyDown" if text else "rawKeyDown",
+            "key": name,
+            "code": code,
+            "windowsVirtualKeyCode": key_code,
+            "modifiers": modifiers | (CDP_MODIFIERS[Keys.SHIFT] if shifted else 0),
+        }
+        if text:
+            down["text"] = text
+        # Synthetic key events do not trigger editing shortcuts on their own
+        commands = CDP_COMMANDS.get((name.lower() if len(name) == 1 else name, modifiers))
+        if commands:
+            down["commands"] = commands
+        await self.send("Input.dispatchKeyEvent", down)
+        up = dict(down, type="keyUp")
+        up.pop("text", None)
+        up.pop("commands", None)
+        await self.send("Input.dispatchKeyEvent", up)
+
+    async def fetch_problem_title(self, timeout=30):
+        title = await self.wait_for(
+            f"document.querySelector({json.dumps(PROBLEM_TITLE_SELECTOR)})?.innerText.trim()",
+            timeout,
+        )
+        self.current_problem = title
+        return title
+
+    async def read_and_highlight_problem(self, read_speed=0.1):
+        """Same in-browser highlight as the sync bot; other tabs keep running meanwhile."""
+        word_count = await self.call_on(
+            PROBLEM_CONTAINER_SELECTOR, HIGHLIGHT_SCRIPT, read_speed
+        )
+        await asyncio.sleep((word_count or 0) * read_speed)
+        await self.wait_for(
+            f"document.querySelector({json.dumps(PROBLEM_CONTAINER_SELECTOR)})?.dataset.readDone === '1'",
+            timeout=10,
+        )
+
+    async def input_code_into_editor(self, code, keystroke_plan=None, input_mode="planned"):
+        """Type the solution, either humanlike from a keystroke plan or as one insertText."""
+        await self.click(EDITOR_SELECTOR)
+        await self.press("a", Keys.CONTROL)
+        await self.press(Keys.DELETE)
+        if input_mode == "block":
+            await self.send("Input.insertText", {"text": "\n".join(line + " " for line in code)})
+            return
+
+        if keystroke_plan is None:
+            keystroke_plan = await asyncio.to_thread(self.planner.plan_code, code)
+        for line_plan in keystroke_plan:
+            for key, pause, modifier in line_plan:
+                await self.press(key, modifier)
+                if pause:
+                    await asyncio.sleep(pause)
+
+    def drain_events(self):
+        """Drop pushed events that are already stale, e.g. the last verdict."""
+        while not self.events.empty():
+            self.events.get_nowait()
+
+    async def watch_submission_result(self, timeout=30):
+        """Wait for the pushed "passed" or "verdict" event after a submit."""
+        try:
+            while True:
+                event = await asyncio.wait_for(self.events.get(), timeout)
+                if event["type"] == "passed":
+                    return {"status": "passed", "passed": True, "error": None}
+                if event["type"] == "verdict" and re.search(
+                    r"Wrong Answer|Error|Exceeded|Failed", event["text"]
+                ):
+                    return {"status": "failed", "passed": False, "error": event["text"]}
+                if event["type"] == "won":
+                    return {"status": "passed", "passed": True, "error": None}
+        except asyncio.TimeoutError:
+            return {"status": "timeout", "passed": False, "error": None}
+
+    async def wait_for_next_problem(self, timeout=30):
+        """Wait for the pushed "problem" (new title) or "won" event."""
+        try:
+            while True:
+                event = await asyncio.wait_for(self.events.get(), timeout)
+                if event["type"] == "won":
+                    return "won"
+                if event["type"] == "problem" and event["text"].strip() != self.current_problem:
+                    return event["text"].strip()
+        except asyncio.TimeoutError:
+            return None
+
+    async def editor_matches(self, lines):
+        """Compare the editor buffer with the solution lines (trailing spaces ignored)."""
+        buffer = await self.call_on(EDITOR_SELECTOR, EDITOR_BUFFER_SCRIPT)
+        current = [line.rstrip() for line in (buffer or "").replace("\u00a0", " ").split("\n")]
+        while current and current[-1] == "":
+            current.pop()
+        return current == [line.rstrip() for line in lines]
+
+    async def play_unranked_game(self, automation, input_mode="planned", max_attempts=3):
+        """Play one unranked game in this tab. Expects an already logged-in browser.
+
+        Candidates are tried in BeatCodeAutomation.solution_order (ranking, offline
+        judge and past outcomes) and their outcomes are recorded like the sync bot
+        does. The problem is read once; each candidate's keystroke plan is computed
+        in a worker thread meanwhile, and game events arrive as pushes.
+
+        Args:
+            automation (BeatCodeAutomation): provides the solution store, the solution
+                order and the outcome log; it does not need a driver
+
+        Returns:
+            dict: won flag, problems solved and submissions
+        """
+        store = automation.get_solution_store()
+        stats = {"won": False, "problems": 0, "submissions": 0}
+        await self.navigate(UNRANKED_URL)
+        await self.wait_for(f"location.href.includes({json.dumps(GAME_URL)})")
+
+        while True:
+            shown_title = await self.fetch_problem_title()
+            if shown_title is None:
+                break
+            title = store.resolve_title(shown_title)
+            if title is None:
+                print(f"[{self.session_id[:8]}] No known problem matches {shown_title!r}.")
+                break
+            solved = False
+            for position, solution_index in enumerate(automation.solution_order(title)):
+                started = asyncio.get_running_loop().time()
+                code = store.get_solution(title, solution_index)
+                lines = automation.process_raw_solution(code)
+                plan_task = asyncio.to_thread(self.planner.plan_code, lines)
+                if position == 0:
+                    _, plan = await asyncio.gather(self.read_and_highlight_problem(), plan_task)
+                else:
+                    plan = await plan_task
+                await self.input_code_into_editor(lines, plan, input_mode)
+
+                submits = 0
+                status = "timeout"
+                for _ in range(max_attempts):
+                    self.drain_events()
+                    await self.click(SUBMIT_BUTTON_SELECTOR)
+                    stats["submissions"] += 1
+                    submits += 1
+                    result = await self.watch_submission_result()
+                    if result["passed"]:
+                        status = "passed"
+                        solved = True
+                        break
+                    if await self.editor_matches(lines):
+                        if result["status"] == "failed":
+                            # The editor holds the solution, so the solution itself is wrong
+                            status = "failed"
+                            break
+                    else:
+                        # Repaired in one insertText rather than line by line
+                        status = "editor"
+                        await self.input_code_into_editor(lines, input_mode="block")
+
+                automation.outcome_log.record(
+                    title,
+                    code,
+                    status,
+                    submits,
+                    asyncio.get_running_loop().time() - started,
+                )
+                if solved:
+                    break
+
+            if not solved:
+                print(f"[{self.session_id[:8]}] Could not solve {title}.")
+                break
+            stats["problems"] += 1
+            await self.click(NEXT_QUESTION_SELECTOR)
+            if await self.wait_for_next_problem() == "won":
+                stats["won"] = True
+                break
+        return stats
+
+
+async def play_in_tabs(debugger_address, tabs=2, input_mode="planned"):
+    """Play one game per tab concurrently in an already running, logged-in Chrome."""
+    # Shared by the tabs, which all run on this event loop's thread
+    automation = BeatCodeAutomation()
+    connection = await CDPConnection.from_debugger_address(debugger_address)
+    try:
+        game_tabs = [await AsyncBeatCodeTab.open(connection) for _ in range(tabs)]
+        results = await asyncio.gather(
+            *(tab.play_unranked_game(automation, input_mode) for tab in game_tabs),
+            return_exceptions=True,
+        )
+        for number, result in enumerate(results):
+            print(f"Tab {number}: {result}")
+        return results
+    finally:
+        await connection.close()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    asyncio.run(
+        play_in_tabs(
+            os.getenv("CHROME_DEBUGGER_ADDRESS", "127.0.0.1:9222"),
+            tabs=int(os.getenv("ASYNC_TABS_BEATCODE", "2")),
+            input_mode=os.getenv("INPUT_MODE_BEATCODE", "planned"),
+        )
+    )
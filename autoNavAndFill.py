@@ -1,38 +1,221 @@
 import os
 import time
-import json
+import re
 import random
+import difflib
 import pyperclip
 from dotenv import load_dotenv
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from pageWaits import PageWaits
+from gamePage import (
+    GamePage,
+    PROBLEM_TITLE_SELECTOR,
+    WINNING_STATE_SELECTOR,
+    NEXT_QUESTION_SELECTOR,
+    TEST_RESULT_SELECTOR,
+)
+from driverFactory import DriverFactory
+from sessionStore import SessionStore
+from gameTrace import GameTrace
+from solutionStore import SolutionStore
+from keystrokePlanner import KeystrokePlanner
+from offlineJudge import load_judge_results, passing_order
+from solutionRanking import load_ranking, ranked_order
+from solutionPrefetcher import SolutionPrefetcher
+from outcomeLog import OutcomeLog
 
 load_dotenv()
 
+# Point BEATCODE_URL at mockBeatCode.py (e.g. http://127.0.0.1:8000) to play offline
+BEATCODE_URL = os.getenv("BEATCODE_URL", "https://www.beatcode.dev").rstrip("/")
+HOME_URL = BEATCODE_URL + "/home"
+LOGIN_URL = BEATCODE_URL + "/login"
+UNRANKED_URL = BEATCODE_URL + "/solo/unranked"
+GAME_URL = BEATCODE_URL + "/game"
+
+# Counts DOM changes in and around the result panel from the moment it runs, so the
+# verdict of a submission is recognised even when it repeats the previous text.
+# arguments[0]: result panel selector.
+ARM_VERDICT_SCRIPT = """
+const selector = arguments[0];
+const touchesPanel = (node) => {
+    const element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+    return !!element && (!!element.closest(selector) || !!element.querySelector(selector));
+};
+if (window.__beatcodeVerdictObserver) window.__beatcodeVerdictObserver.disconnect();
+window.__beatcodeVerdictChanges = 0;
+window.__beatcodeVerdictObserver = new MutationObserver((mutations) => {
+    for (const mutation of mutations) {
+        if (touchesPanel(mutation.target) || Array.from(mutation.addedNodes).some(touchesPanel)) {
+            window.__beatcodeVerdictChanges += 1;
+            return;
+        }
+    }
+});
+window.__beatcodeVerdictObserver.observe(document.documentElement, {
+    childList: true,
+    subtree: true,
+    characterData: true,
+});
+"""
+
+# Resolves with {status: "passed"} once the next button is clickable (shown and
+# enabled), or with the panel text once the result panel changed after the submit
+# (see ARM_VERDICT_SCRIPT) and shows a verdict. args[0]: next button selector,
+# args[1]: result panel selector.
+SUBMISSION_RESULT_PREDICATE = """
+const next = document.querySelector(args[0]);
+if (next && !next.disabled && next.getClientRects().length &&
+        getComputedStyle(next).visibility !== "hidden") {
+    return {status: "passed", text: ""};
+}
+const panel = document.querySelector(args[1]);
+if (!panel || !window.__beatcodeVerdictChanges) return null;
+const text = panel.innerText;
+const verdict = /(Wrong Answer|Runtime Error|Time Limit Exceeded|Memory Limit Exceeded|Compilation Error|Syntax Error|Failed)/;
+return verdict.test(text) ? {status: "failed", text: text} : null;
+"""
+
+# Resolves with "won" once the result banner shows, or with the new title once
+# the problem heading changes. args[0]: title selector, args[1]: old title,
+# args[2]: banner selector.
+NEXT_PROBLEM_PREDICATE = """
+if (document.querySelector(args[2])) return "won";
+const title = document.querySelector(args[0]);
+if (!title) return null;
+const text = title.textContent.trim();
+return text && text !== args[1] ? text : null;
+"""
+
+# Strategies accepted by BeatCodeAutomation.input_code_into_editor
+INPUT_MODES = ("humanlike", "planned", "line", "block")
+
+# Wraps every word of the problem once, then walks the highlight on a browser timer.
+# Sets data-read-done="1" on the container once the original HTML is restored.
+HIGHLIGHT_SCRIPT = """
+const container = arguments[0];
+const readSpeed = arguments[1];
+const children = Array.from(container.children);
+const originals = children.map((child) => child.innerHTML);
+const spans = [];
+
+for (const child of children) {
+    const walker = document.createTreeWalker(child, NodeFilter.SHOW_TEXT);
+    const nodes = [];
+    while (walker.nextNode()) nodes.push(walker.currentNode);
+
+    for (const node of nodes) {
+        if (!node.textContent.trim()) continue;
+        const fragment = document.createDocumentFragment();
+        for (const part of node.textContent.split(/(\\s+)/)) {
+            if (!part) continue;
+            if (!part.trim()) {
+                fragment.appendChild(document.createTextNode(part));
+                continue;
+            }
+            const span = document.createElement("span");
+            span.textContent = part;
+            spans.push(span);
+            fragment.appendChild(span);
+        }
+        node.parentNode.replaceChild(fragment, node);
+    }
+}
+
+container.dataset.readDone = "0";
+let index = 0;
+const timer = setInterval(() => {
+    if (index > 0) spans[index - 1].style.backgroundColor = "";
+    if (index >= spans.length) {
+        clearInterval(timer);
+        children.forEach((child, i) => (child.innerHTML = originals[i]));
+        container.dataset.readDone = "1";
+        return;
+    }
+    spans[index].style.backgroundColor = "#1e8758";
+    index++;
+}, readSpeed * 1000);
+
+return spans.length;
+"""
+
+# Reads the whole editor buffer: CodeMirror view, then Monaco model, then rendered lines.
+EDITOR_BUFFER_SCRIPT = """
+const editor = arguments[0];
+const tile = editor.cmView;
+const view = tile && (tile.view || (tile.rootView && tile.rootView.view));
+if (view) return view.state.doc.toString();
+
+if (window.monaco && window.monaco.editor) {
+    const models = window.monaco.editor.getModels();
+    if (models.length) return models[0].getValue();
+}
+
+const lines = editor.querySelectorAll(".cm-line, .view-line");
+if (lines.length) return Array.from(lines, (line) => line.textContent).join("\\n");
+return editor.innerText;
+"""
+
 
 class BeatCodeAutomation:
-    def __init__(self):
+    def __init__(self, solution_store=None):
+        """
+        Args:
+            solution_store (SolutionStore, optional): share an already loaded store,
+                e.g. between orchestrated workers. Loaded on first use otherwise.
+        """
         self.driver = None
+        self.driver_factory = None
         self.wait = None
-
-    def setup_driver(self):
+        self.waits = None
+        self.page = None
+        self.trace = GameTrace()
+        self.solution_store = solution_store
+        self.current_problem = None
+        self.current_title = None
+        self.typing_seed = None
+        self.judge_results = None
+        self.solution_ranking = None
+        self.current_solution_idx = None
+        self.current_order = []
+        self.outcome_log = None
+
+    def setup_driver(self, driver_factory=None):
         """
         Set up the Selenium WebDriver with the specified ChromeDriver path.
+
+        Args:
+            driver_factory (DriverFactory, optional): how to build the browser.
+                Defaults to DriverFactory.from_env() (headless, blocking, profile dir...).
         """
-        chrome_driver_path = os.getenv("CHROME_DRIVER_PATH")
-        self.driver = webdriver.Chrome(service=Service(chrome_driver_path))
+        self.driver_factory = driver_factory or DriverFactory.from_env()
+        self.driver = self.driver_factory.create()
         self.wait = WebDriverWait(self.driver, 10)
+        self.waits = PageWaits(self.driver)
+        self.page = GamePage(self.driver)
+        self.trace.attach(self.driver)
+
+    def sleep(self, seconds):
+        """Pause like time.sleep, booking the pause on the current trace phase."""
+        self.trace.sleep(seconds)
 
     def teardown_driver(self):
         """
         Quit the Selenium WebDriver.
         """
         if self.driver:
+            if self.driver_factory and self.driver_factory.debugger_address:
+                # Leave the attached browser running for the next game
+                print("Detaching from the running Chrome.")
+                self.driver.service.stop()
+                return
             self.driver.quit()
 
     def handle_login(self, username, password):
@@ -62,6 +245,41 @@ class BeatCodeAutomation:
         except Exception as e:
             print(f"Failed to log in. Error: {e}")
 
+    def start_unranked_game(self, username, password, session_store=None):
+        """Open the unranked game, logging in only when the saved session is gone.
+
+        A restored session goes straight to /solo/unranked. A fresh login is
+        saved so the next run can skip handle_login and the /home redirect.
+
+        Args:
+            username (str): just a valid email
+            password (str): and a valid password
+            session_store (SessionStore, optional): where the session is kept. Defaults to session.json.
+        """
+        session_store = session_store or SessionStore()
+        if session_store.restore(self.driver):
+            self.driver_factory.measure_page_load(self.driver, UNRANKED_URL)
+            if LOGIN_URL not in self.driver.current_url:
+                print("Reused the saved session.")
+                self.check_if_on_game_room()
+                return
+            print("Saved session was rejected, logging in again.")
+            session_store.clear()
+        else:
+            self.driver_factory.measure_page_load(self.driver, HOME_URL)
+
+        if LOGIN_URL in self.driver.current_url:
+            self.handle_login(username, password)
+            self.waits.url_changes(LOGIN_URL)
+            session_store.save(self.driver)
+        else:
+            print("You are on the home page")
+
+        # Navigate to unrank page
+        known_handles = self.driver.window_handles
+        self.navigate_to_unrank_page()
+        self.check_if_on_game_room(known_handles)
+
     def navigate_to_custom_page(self):
         """Navigate to the custom page on the BeatCode website."""
         try:
@@ -84,7 +302,6 @@ class BeatCodeAutomation:
             )
 
             custom_button.click()
-            time.sleep(1)
             print("Navigating to custom page")
         except Exception as e:
             print(f"Failed to navigate to unrank page. Error: {e}")
@@ -176,48 +393,104 @@ class BeatCodeAutomation:
         except Exception as e:
             print(f"Failed to locate or click the button. Error: {e}")
 
-    def switch_to_new_window(self):
-        """Switch to the new game window that opens after clicking the 'Next' button."""
+    def switch_to_new_window(self, known_handles=None):
+        """Switch to the new game window that opens after clicking the 'Next' button.
+
+        Args:
+            known_handles (list, optional): the windows open before the click.
+                Defaults to the current window only.
+        """
         try:
             original_window = self.driver.current_window_handle
             print(f"Original window: {original_window}")
 
-            WebDriverWait(self.driver, 10).until(lambda d: len(d.window_handles) > 1)
-
-            for window in self.driver.window_handles:
-                if window != original_window:
-                    self.driver.switch_to.window(window)
-                    print(f"Switched to new window: {window}")
-                    break
+            # The game may also load in the current window instead
+            window = self.waits.new_window(
+                known_handles or [original_window], GAME_URL, timeout=10
+            )
+            if window != original_window:
+                self.driver.switch_to.window(window)
+                print(f"Switched to new window: {window}")
         except Exception as e:
             print(f"Failed to switch to the new window. Error: {e}")
 
-    def check_if_on_game_room(self):
-        """Check if the current URL is the game room URL."""
+    def check_if_on_game_room(self, known_handles=None):
+        """Check if the current URL is the game room URL.
+
+        Args:
+            known_handles (list, optional): the windows open before the unranked link
+                was clicked; the game room may open in a new one. None when the URL
+                was opened directly.
+        """
+        # Handles cached for an earlier game room belong to a document that is gone
+        self.page.invalidate()
         try:
-            self.switch_to_new_window()
-            attempts = 0
-            while (
-                "https://www.beatcode.dev/game" not in self.driver.current_url
-                and attempts < 5
-            ):
-                time.sleep(5)
-                print("Waiting for game room to load...")
-                attempts += 1
-
-            if "https://www.beatcode.dev/game" in self.driver.current_url:
+            # Clicking the unranked link opens a new window, opening the URL does not
+            if known_handles is not None:
+                self.switch_to_new_window(known_handles)
+            print("Waiting for game room to load...")
+            try:
+                self.waits.url_contains(GAME_URL, timeout=25)
                 print("Successfully navigated to the game room.")
-            else:
+            except TimeoutException:
                 print("Game room did not load in time.")
         except Exception as e:
             print(f"Error while checking for game room. Error: {e}")
 
-    def fetch_problem_solution(self, filename="solutions.json", useSolutionIdx=0):
+    def get_solution_store(self, filename="solutions.json"):
+        """Return the in-memory solution store, loading it on first use.
+
+        Args:
+            filename (str, optional): json file containing answer key. Defaults to "solutions.json".
+
+        Returns:
+            SolutionStore: the store backed by `filename`
+        """
+        if self.solution_store is None or self.solution_store.filename != filename:
+            self.solution_store = SolutionStore(filename)
+        return self.solution_store
+
+    def solution_order(self, problem_name, filename="solutions.json"):
+        """Order the solutions of a problem so known-passing ones are tried first.
+
+        Uses the benchmark ranking (solution_ranking.json) when the problem has been
+        ranked, otherwise the offline judge results (judge_results.json). Outcomes of
+        earlier games (outcomes.db) then move proven solutions up and drop the ones
+        that keep getting rejected.
+
+        Args:
+            problem_name (str): the problem title
+            filename (str, optional): json file containing answer key. Defaults to "solutions.json".
+
+        Returns:
+            list: solution indices in the order they should be tried
+        """
+        store = self.get_solution_store(filename)
+        solution_count = store.count_solutions(problem_name)
+        if self.solution_ranking is None:
+            self.solution_ranking = load_ranking()
+        order = ranked_order(self.solution_ranking, problem_name, solution_count)
+        if order is None:
+            if self.judge_results is None:
+                self.judge_results = load_judge_results()
+            order = passing_order(self.judge_results, problem_name, solution_count)
+
+        if self.outcome_log is None:
+            self.outcome_log = OutcomeLog()
+        codes = {index: store.get_solution(problem_name, index) for index in order}
+        return self.outcome_log.reorder(problem_name, order, codes)
+
+    def fetch_problem_solution(
+        self, filename="solutions.json", useSolutionIdx=0, prefetcher=None
+    ):
         """Fetch the solution code for the current problem statement.
 
         Args:
             filename (str, optional): json file containing answer key. Defaults to "solutions.json".
-            useSolutionIdx (int, optional): index to get the solution. Defaults to 0.
+            useSolutionIdx (int, optional): position in solution_order, so 0 is the best
+                known candidate. Defaults to 0.
+            prefetcher (SolutionPrefetcher, optional): reuses the solution order it
+                prepared for this problem instead of computing it again.
 
         Returns:
             _type_: the code to the problem statement
@@ -225,26 +498,48 @@ class BeatCodeAutomation:
         TODO: Add the ability to fetch the solution on the go
         TODO: Add robustness for useSolutionIdx (various index should be accepted)
         """
-        solutions = {}
         try:
-            problem_statement = self.wait.until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "h2.mb-2.text-2xl.font-semibold")
-                )
-            )
-
-            problem_statement_text = problem_statement.text
+            problem_statement_text = self.page.text("problem_title")
+            # The page text is kept as is, wait_for_next_problem compares against it
+            self.current_problem = problem_statement_text
             print(f"Problem statement: {problem_statement_text}")
 
-            with open(filename, "r") as file:
-                solutions = json.load(file)
-            return solutions[problem_statement_text]["solutions"][useSolutionIdx][
-                "code"
-            ]
+            store = self.get_solution_store(filename)
+            self.current_title = store.resolve_title(problem_statement_text)
+            if self.current_title is None:
+                print(f"No known problem matches {problem_statement_text!r}.")
+                return None
+            if self.current_title != problem_statement_text:
+                print(f"Matched {problem_statement_text!r} to {self.current_title!r}.")
+
+            # One order per problem, so recording an outcome does not shift the positions
+            if useSolutionIdx == 0 or not self.current_order:
+                prepared_order = prefetcher and prefetcher.order_for(self.current_title)
+                self.current_order = prepared_order or self.solution_order(
+                    self.current_title, filename
+                )
+            self.current_solution_idx = self.current_order[useSolutionIdx]
+            return store.get_solution(self.current_title, self.current_solution_idx)
 
         except Exception as e:
             print(f"Failed to fetch the problem statement. Error: {e}")
 
+    def count_problem_solutions(self, filename="solutions.json"):
+        """Count the solutions left to try for the last fetched problem.
+
+        Args:
+            filename (str, optional): json file containing answer key. Defaults to "solutions.json".
+
+        Returns:
+            int: the number of candidates in the problem's solution order (known failures
+                are not counted), 0 if no problem has been fetched yet
+        """
+        if self.current_title is None:
+            return 0
+        if not self.current_order:
+            self.current_order = self.solution_order(self.current_title, filename)
+        return len(self.current_order)
+
     def process_raw_solution(self, raw_solution):
         """Process the raw solution code into a list of lines.
 
@@ -268,6 +563,8 @@ class BeatCodeAutomation:
         typing_speed_short=0.05,
         typing_speed_long=0.3,
         typo_chance=0.15,
+        input_mode="humanlike",
+        keystroke_plan=None,
     ):
         """
         Input the code into the editor on the game room page
@@ -278,44 +575,163 @@ class BeatCodeAutomation:
             typing_speed_short (float, optional): typing speed for short line. Defaults to 0.05.
             typing_speed_long (float, optional): typing speed for long line. Defaults to 0.5.
             typo_chance (float, optional): Chance to get a typo. Defaults to 0.15.
+            input_mode (str, optional): one of INPUT_MODES. "humanlike" types char by char,
+                "planned" types the same humanlike schedule as one ActionChains batch per line,
+                "line" sends a whole line per call, "block" inserts the whole solution at once.
+                Defaults to "humanlike".
+            keystroke_plan (list, optional): precomputed KeystrokePlanner.plan_code output
+                for the "planned" mode. Planned on the fly when omitted.
+
+        Returns:
+            float: seconds spent inputting the code, None on failure
         """
+        if input_mode not in INPUT_MODES:
+            print(f"Unknown input mode {input_mode}, falling back to humanlike.")
+            input_mode = "humanlike"
+
         try:
-            editor_container = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='textbox']"))
-            )
+            started = time.perf_counter()
+            editor_container = self.page.focus("editor")
             print("Editor container located.")
-
-            editor_container.click()
-            time.sleep(1)
+            if input_mode == "humanlike":
+                self.sleep(1)
 
             editor_container.send_keys(Keys.CONTROL + "a")
             editor_container.send_keys(Keys.DELETE)
 
             print("here here here!", code)
-            for line in code:
-                typing_speed = (
-                    typing_speed_short
-                    if len(line.strip()) <= short_line_threshold
-                    else typing_speed_long
-                )
+            if input_mode == "block":
+                self.insert_block_into_editor(code, editor_container)
+            elif input_mode == "planned":
+                if keystroke_plan is None:
+                    keystroke_plan = KeystrokePlanner(
+                        typo_chance,
+                        typing_speed_short,
+                        typing_speed_long,
+                        short_line_threshold,
+                        seed=self.typing_seed,
+                    ).plan_code(code)
+                for line_plan in keystroke_plan:
+                    self.perform_keystroke_plan(line_plan)
+            else:
+                for line in code:
+                    if input_mode == "line":
+                        self.insert_line_into_editor(line, editor_container)
+                        continue
+
+                    typing_speed = (
+                        typing_speed_short
+                        if len(line.strip()) <= short_line_threshold
+                        else typing_speed_long
+                    )
 
-                editor_container.send_keys(Keys.CONTROL + Keys.BACKSPACE)
+                    editor_container.send_keys(Keys.CONTROL + Keys.BACKSPACE)
 
-                self.typing_code_into_editor(
-                    line,
-                    typo_chance,
-                    editor_container,
-                    typing_speed_short,
-                    typing_speed_long,
-                    typing_speed,
-                )
+                    self.typing_code_into_editor(
+                        line,
+                        typo_chance,
+                        editor_container,
+                        typing_speed_short,
+                        typing_speed_long,
+                        typing_speed,
+                    )
 
-                editor_container.send_keys(Keys.RETURN)
+                    editor_container.send_keys(Keys.RETURN)
 
-            print("Code successfully input into the editor.")
+            elapsed = time.perf_counter() - started
+            print(
+                f"Code successfully input into the editor ({input_mode}, {len(code)} lines, {elapsed:.2f}s)."
+            )
+            return elapsed
         except Exception as e:
             print(f"Failed to input code into the editor. Error: {e}")
 
+    def insert_line_into_editor(self, line, editor_container):
+        """Send one whole line in a single WebDriver call.
+
+        The key sequence is the same as the humanlike mode without the typos
+        and pauses: drop the auto indent, type the line, add a trailing space to
+        close the suggestion box, remove auto-closed docstring quotes, newline.
+
+        Args:
+            line (str): the line of code
+            editor_container (WebElement): the editor textbox
+        """
+        # Modifier keys stay pressed until Keys.NULL within one send_keys call
+        keys = [Keys.CONTROL + Keys.BACKSPACE + Keys.NULL, line, Keys.SPACE]
+        if line.startswith('"""') or line.startswith("'''"):
+            keys.append(Keys.CONTROL + Keys.DELETE + Keys.NULL)
+        keys.append(Keys.RETURN)
+        editor_container.send_keys(*keys)
+
+    def perform_keystroke_plan(self, line_plan):
+        """Run the keystroke schedule of one line as a single ActionChains batch.
+
+        The pauses are executed by the browser session, so the whole line costs
+        one WebDriver round-trip instead of one or three per character.
+
+        Args:
+            line_plan (list): (key, pause, modifier) tuples from KeystrokePlanner.plan_line
+        """
+        actions = ActionChains(self.driver)
+        for key, pause, modifier in line_plan:
+            if modifier:
+                actions.key_down(modifier).send_keys(key).key_up(modifier)
+            else:
+                actions.send_keys(key)
+            if pause:
+                actions.pause(pause)
+        actions.perform()
+
+    def insert_block_into_editor(self, code, editor_container):
+        """Insert the whole solution with a single insertText call.
+
+        Inserted text does not go through the editor's key handlers, so there is
+        no auto indent or bracket closing to undo. Uses CDP when the driver
+        supports it and falls back to document.execCommand otherwise.
+
+        Args:
+            code (list): the lines of the solution code
+            editor_container (WebElement): the editor textbox
+        """
+        # Keep the trailing space of the typed modes so check_line_deletion still matches
+        text = "\n".join(line + " " for line in code)
+        try:
+            self.driver.execute_cdp_cmd("Input.insertText", {"text": text})
+        except Exception:
+            self.driver.execute_script(
+                "arguments[0].focus(); document.execCommand('insertText', false, arguments[1]);",
+                editor_container,
+                text,
+            )
+
+    def compare_input_modes(self, code, modes=INPUT_MODES, **typing_options):
+        """Type the same solution with each input mode and print the timings.
+
+        Args:
+            code (list): the lines of the solution code
+            modes (tuple, optional): the input modes to compare. Defaults to INPUT_MODES.
+            **typing_options: forwarded to input_code_into_editor
+
+        Returns:
+            dict: input mode -> seconds spent
+        """
+        timings = {}
+        for mode in modes:
+            timings[mode] = self.input_code_into_editor(
+                code.copy(), input_mode=mode, **typing_options
+            )
+
+        baseline = timings.get("humanlike")
+        for mode, elapsed in timings.items():
+            if elapsed is None:
+                print(f"{mode:>10}: failed")
+            elif baseline:
+                print(f"{mode:>10}: {elapsed:8.2f}s  ({baseline / max(elapsed, 1e-6):.1f}x)")
+            else:
+                print(f"{mode:>10}: {elapsed:8.2f}s")
+        return timings
+
     def typing_code_into_editor(
         self,
         line,
@@ -329,29 +745,36 @@ class BeatCodeAutomation:
             if random.random() < typo_chance:
                 typo_char = random.choice("abcdefghijklmnopqrstuvwxyz")
                 editor_container.send_keys(typo_char)
-                time.sleep(typing_speed)
+                self.sleep(typing_speed)
                 editor_container.send_keys(Keys.BACKSPACE)
-                time.sleep(typing_speed)
+                self.sleep(typing_speed)
             editor_container.send_keys(char)
-            time.sleep(random.uniform(typing_speed_short, typing_speed_long))
+            self.sleep(random.uniform(typing_speed_short, typing_speed_long))
         # Handle comment out case:
         editor_container.send_keys(Keys.SPACE)
 
         if line.startswith('"""') or line.startswith("'''"):
             editor_container.send_keys(Keys.CONTROL + Keys.DELETE)
-        time.sleep(typing_speed)
+        self.sleep(typing_speed)
+
+    def read_and_highlight_problem(self, read_speed=0.1, in_browser=False):
+        """Read the problem statement and highlight the keywords.
 
-    def read_and_highlight_problem(self, read_speed=0.1):
-        """Read the problem statement and highlight the keywords."""
+        Args:
+            read_speed (float, optional): seconds each word stays highlighted. Defaults to 0.1.
+            in_browser (bool, optional): run the whole highlight with one script and a
+                browser timer instead of one execute_script per word. Defaults to False.
+        """
         try:
-            problem_container = self.wait.until(
-                EC.presence_of_element_located(
-                    (
-                        By.CSS_SELECTOR,
-                        "div.h-full.overflow-y-auto.bg-background.px-4.py-5 > div:nth-child(3)",
-                    )
+            if in_browser:
+                self.page.run(
+                    "problem_container",
+                    lambda container: self.highlight_in_browser(container, read_speed),
                 )
-            )
+                print("Finished reading the problem statement.")
+                return
+
+            problem_container = self.page.element("problem_container")
             print("Problem container located.")
 
             children = problem_container.find_elements(By.XPATH, "./*")
@@ -377,7 +800,7 @@ class BeatCodeAutomation:
                         child,
                         highlighted_html,
                     )
-                    time.sleep(read_speed)
+                    self.sleep(read_speed)
 
                 highlighted_html = " ".join(innerHTML)
                 self.driver.execute_script(
@@ -388,6 +811,26 @@ class BeatCodeAutomation:
         except Exception as e:
             print(f"Failed to read and highlight the problem statement. Error: {e}")
 
+    def highlight_in_browser(self, problem_container, read_speed):
+        """Start HIGHLIGHT_SCRIPT on the problem and wait until it has finished.
+
+        Args:
+            problem_container (WebElement): the element holding the problem description
+            read_speed (float): seconds each word stays highlighted
+        """
+        word_count = self.driver.execute_script(
+            HIGHLIGHT_SCRIPT, problem_container, read_speed
+        )
+        print(f"Highlighting {word_count} words in the browser.")
+
+        # Sleep through the expected duration, then confirm with a few cheap polls
+        self.sleep(word_count * read_speed)
+        WebDriverWait(self.driver, 10, poll_frequency=0.2).until(
+            lambda d: d.execute_script(
+                "return arguments[0].dataset.readDone === '1';", problem_container
+            )
+        )
+
     def native_html(self, word):
         """Highlight the word in the HTML format
 
@@ -409,31 +852,72 @@ class BeatCodeAutomation:
         Click the submit button to complete the program submission.
         """
         try:
-            # Locate the button using a combination of class names
-            submit_button = self.wait.until(
-                EC.element_to_be_clickable(
-                    (
-                        By.CSS_SELECTOR,
-                        "button.ring-offset-background.focus-visible\\:ring-ring.inline-flex.justify-center.gap-2",
-                    )
-                )
-            )
-            # Click the button
-            submit_button.click()
+            # Only panel changes from now on count, the old verdict may come back unchanged
+            self.driver.execute_script(ARM_VERDICT_SCRIPT, TEST_RESULT_SELECTOR)
+            # The handle is cached, so retries skip the find_element
+            self.page.click("submit_button")
             print("Clicked the submit button.")
         except Exception as e:
             print(f"Failed to locate or click the submit button. Error: {e}")
 
-    def check_passing_problem(self):
+    def watch_submission_result(self, timeout=30):
+        """Wait for the pass button or a new verdict, whichever appears first.
+
+        Args:
+            timeout (int, optional): maximum seconds to wait for the judge. Defaults to 30.
+
+        Returns:
+            dict: status ("passed", "failed" or "timeout"), passed flag, failed_test
+                (0-based, None if unknown) and error (the verdict line, None if passed)
+        """
+        result = {"status": "timeout", "passed": False, "failed_test": None, "error": None}
         try:
-            submit_button = self.wait.until(
-                EC.element_to_be_clickable(
-                    (
-                        By.CSS_SELECTOR,
-                        "button.ring-offset-background.focus-visible\\:ring-ring.inline-flex.justify-center.h-10",
-                    )
-                )
+            outcome = self.waits.mutation(
+                SUBMISSION_RESULT_PREDICATE,
+                NEXT_QUESTION_SELECTOR,
+                TEST_RESULT_SELECTOR,
+                timeout=timeout,
             )
+        except Exception as e:
+            print(f"Failed to watch the submission result. Error: {e}")
+            return result
+
+        if outcome is None:
+            print("No submission result before the timeout.")
+            return result
+        if outcome["status"] == "passed":
+            print("Problem passed.")
+            result.update(status="passed", passed=True)
+            return result
+
+        result.update(self.parse_submission_failure(outcome["text"]), status="failed")
+        print(f"Submission failed: {result['error']} (test {result['failed_test']}).")
+        return result
+
+    def parse_submission_failure(self, text):
+        """Pull the failed test index and the verdict/error line out of the panel text.
+
+        Args:
+            text (str): the test result panel text
+
+        Returns:
+            dict: failed_test (0-based, None if not shown) and error
+        """
+        failed_test = None
+        match = re.search(r"(?:Test\s*case|Case)\s*#?\s*(\d+)", text, re.IGNORECASE)
+        if match:
+            failed_test = int(match.group(1)) - 1
+
+        error = None
+        for line in text.splitlines():
+            if re.search(r"Error|Exceeded|Wrong Answer|Failed", line):
+                error = line.strip()
+                break
+        return {"failed_test": failed_test, "error": error}
+
+    def check_passing_problem(self):
+        try:
+            self.page.element("next_button", clickable=True)
             print("Problem passed.")
             return True
         except Exception as e:
@@ -441,25 +925,34 @@ class BeatCodeAutomation:
 
     def click_next_question(self):
         try:
-            submit_button = self.wait.until(
-                EC.element_to_be_clickable(
-                    (
-                        By.CSS_SELECTOR,
-                        "button.ring-offset-background.focus-visible\\:ring-ring.inline-flex.justify-center.h-10",
-                    )
-                )
-            )
-            submit_button.click()
+            self.page.click("next_button")
+            # The next problem re-renders the statement, editor and buttons
+            self.page.invalidate()
         except Exception as e:
             print(f"Failed to locate or click the next question button. Error: {e}")
 
-    def check_winning_state(self):
+    def check_winning_state(self, timeout=10):
+        """Check whether the game has been won.
+
+        Args:
+            timeout (int, optional): seconds to wait for the result banner. 0 checks the
+                current page without waiting. Defaults to 10.
+
+        Returns:
+            bool: True if the "You won!" banner is shown
+        """
         try:
-            winning_state = self.wait.until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "div.mb-10.font-icon.text-5xl.font-bold")
+            if timeout:
+                winning_state = WebDriverWait(self.driver, timeout).until(
+                    EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, WINNING_STATE_SELECTOR)
+                    )
                 )
-            )
+            else:
+                banners = self.driver.find_elements(By.CSS_SELECTOR, WINNING_STATE_SELECTOR)
+                if not banners:
+                    return False
+                winning_state = banners[0]
             print("Winning state found.")
             if "You won!" in winning_state.text:
                 print("You won!")
@@ -470,15 +963,35 @@ class BeatCodeAutomation:
             print(f"Failed to locate winning state. Error: {e}")
         return False
 
+    def wait_for_next_problem(self, previous_title, timeout=30):
+        """Wait until the next problem is shown or the game is over.
+
+        Args:
+            previous_title (str): the title of the problem that was just solved
+            timeout (int, optional): maximum seconds to wait. Defaults to 30.
+
+        Returns:
+            str: the new problem title, "won" when the result banner appeared, None on timeout
+        """
+        try:
+            outcome = self.waits.mutation(
+                NEXT_PROBLEM_PREDICATE,
+                PROBLEM_TITLE_SELECTOR,
+                previous_title or "",
+                WINNING_STATE_SELECTOR,
+                timeout=timeout,
+            )
+            print(f"Next page state: {outcome}")
+            return outcome
+        except Exception as e:
+            print(f"Failed to wait for the next problem. Error: {e}")
+
     def navigate_to_custom(self):
+        # Each step waits for its own element to become clickable
         self.navigate_to_custom_page()
-        time.sleep(1)
         self.navigate_to_lobby_page()
-        time.sleep(1)
         self.click_join_room_laufey()
-        time.sleep(1)
         self.click_next_button()
-        time.sleep(5)
 
     def got_used_deletio(self):
         pass
@@ -491,13 +1004,10 @@ class BeatCodeAutomation:
             code_solution (list): containing each line of the solution code
         """
         try:
-            editor_container = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='textbox']"))
-            )
-            editor_container.send_keys(
-                Keys.PAGE_UP
+            editor_container = self.page.run(
+                "editor", lambda editor: editor.send_keys(Keys.PAGE_UP) or editor
             )  # Navigate to the top of the editor
-            time.sleep(0.5)
+            self.sleep(0.5)
 
             print(code_solution)
 
@@ -509,7 +1019,7 @@ class BeatCodeAutomation:
                     Keys.SHIFT + Keys.END
                 )  # Select the whole line
                 editor_container.send_keys(Keys.CONTROL + "c")  # Copy the line
-                time.sleep(1)
+                self.sleep(1)
                 current_line = str(pyperclip.paste())  # Get the copied line
                 print("minhdz", current_line, "inside the code")
                 print("ducxdz", line + " ", "ground truth")
@@ -529,91 +1039,292 @@ class BeatCodeAutomation:
                 editor_container.send_keys(
                     Keys.ARROW_DOWN
                 )  # Move to beginning of the next line
-                time.sleep(1)
+                self.sleep(1)
         except Exception as e:
             print(f"Failed to locate the editor container. Error: {e}")
 
+    def read_editor_buffer(self, editor_container):
+        """Read the whole editor content with a single execute_script call.
 
-# Example usage:
-if __name__ == "__main__":
-    load_dotenv()
+        Args:
+            editor_container (WebElement): the editor textbox
 
-    automation = BeatCodeAutomation()
-    automation.setup_driver()
+        Returns:
+            list: the lines currently in the editor
+        """
+        buffer = self.driver.execute_script(EDITOR_BUFFER_SCRIPT, editor_container)
+        return buffer.replace("\u00a0", " ").split("\n")
 
-    try:
-        automation.driver.get("https://www.beatcode.dev/home")
-        if automation.driver.current_url == "https://www.beatcode.dev/home":
-            print("You are on the home page")
-        elif automation.driver.current_url == "https://www.beatcode.dev/login":
-            automation.handle_login(
-                os.getenv("USERNAME_BEATCODE"), os.getenv("PASSWORD_BEATCODE")
-            )
-            time.sleep(2)
+    def repair_editor_buffer(self, code_solution):
+        """Diff the editor buffer against the solution and retype only damaged lines.
 
-            # Navigate to unrank page
-            automation.navigate_to_unrank_page()
-            automation.check_if_on_game_room()
-            time.sleep(2)
+        Unlike check_line_deletion this needs no clipboard and no per-line
+        round-trips, so recovery time scales with the number of damaged lines.
 
-            solution_index = 0  # Start with the first solution
+        Args:
+            code_solution (list): containing each line of the solution code
 
-            while not automation.check_winning_state():
-                try:
-                    # Fetch and process the current solution
-                    code = automation.fetch_problem_solution(
-                        "solutions.json", solution_index
+        Returns:
+            int: the number of solution lines that were retyped, None on failure
+        """
+        try:
+            buffer = self.page.run("editor", self.read_editor_buffer)
+            editor_container = self.page.element("editor")
+            current = [line.rstrip() for line in buffer]
+            expected = [line.rstrip() for line in code_solution]
+            # The final RETURN leaves an empty last line behind
+            ends_with_blank = bool(current) and current[-1] == ""
+            while current and current[-1] == "":
+                current.pop()
+
+            opcodes = [
+                opcode
+                for opcode in difflib.SequenceMatcher(
+                    None, current, expected, autojunk=False
+                ).get_opcodes()
+                if opcode[0] != "equal"
+            ]
+            if not opcodes:
+                print("Editor content matches the solution.")
+                return 0
+
+            retyped = 0
+            # Bottom-up so the line numbers of earlier hunks stay valid
+            for tag, i1, i2, j1, j2 in reversed(opcodes):
+                print(f"Repairing editor lines {i1 + 1}-{i2} ({tag}).")
+                if tag == "insert" and i1 == len(current):
+                    self.append_editor_lines(
+                        editor_container, code_solution[j1:j2], ends_with_blank
                     )
+                    retyped += j2 - j1
+                    continue
+                if tag == "insert":
+                    # Retype the following line too so the hunk has a line to replace
+                    i2, j2 = i1 + 1, j2 + 1
+                self.retype_editor_lines(
+                    editor_container, i1, i2, code_solution[j1:j2]
+                )
+                retyped += j2 - j1
+            return retyped
+        except Exception as e:
+            print(f"Failed to repair the editor content. Error: {e}")
+
+    def retype_editor_lines(self, editor_container, start, end, lines):
+        """Replace editor lines [start, end) with `lines`.
 
-                    automation.read_and_highlight_problem()
-                    time.sleep(2)
-                    processedCode = automation.process_raw_solution(code)
+        Args:
+            editor_container (WebElement): the editor textbox
+            start (int): first editor line to replace (0-based)
+            end (int): editor line after the last one to replace
+            lines (list): the solution lines to type instead
+        """
+        # Column 0 of the first line; ARROW_DOWN keeps the column at 0
+        keys = [Keys.CONTROL + Keys.HOME + Keys.NULL] + [Keys.ARROW_DOWN] * start
+        if not lines:
+            # Select whole lines including their line breaks and drop them
+            keys += [Keys.SHIFT] + [Keys.ARROW_DOWN] * (end - start) + [Keys.NULL]
+            keys.append(Keys.DELETE)
+            editor_container.send_keys(*keys)
+            return
+
+        keys += [Keys.SHIFT] + [Keys.ARROW_DOWN] * (end - start - 1)
+        keys += [Keys.END, Keys.NULL, Keys.DELETE]
+        editor_container.send_keys(*keys)
+        self.typing_editor_lines(editor_container, lines)
+
+    def append_editor_lines(self, editor_container, lines, ends_with_blank):
+        """Type `lines` after the last line of the editor.
 
-                    # Input the solution into the editor
-                    automation.input_code_into_editor(processedCode.copy())
-                    time.sleep(1)
+        Args:
+            editor_container (WebElement): the editor textbox
+            lines (list): the solution lines to append
+            ends_with_blank (bool): whether the buffer already ends with an empty line
+        """
+        keys = [Keys.CONTROL + Keys.END + Keys.NULL]
+        if not ends_with_blank:
+            keys.append(Keys.RETURN)
+        # Clear the auto indent without joining the line to the previous one
+        keys += [Keys.SHIFT + Keys.HOME + Keys.NULL, Keys.DELETE]
+        editor_container.send_keys(*keys)
+        self.typing_editor_lines(editor_container, lines)
+
+    def typing_editor_lines(self, editor_container, lines):
+        """Type consecutive solution lines at the cursor, humanlike."""
+        for index, line in enumerate(lines):
+            if index > 0:
+                editor_container.send_keys(
+                    Keys.RETURN, Keys.CONTROL + Keys.BACKSPACE + Keys.NULL
+                )
+            self.typing_code_into_editor(line, 0.15, editor_container, 0.05, 0.3, 0.05)
 
-                    # Attempt to submit up to 3 times
-                    submission_success = False  # Track if submission succeeds
-                    for attempt in range(3):
-                        print(
-                            f"Submission attempt {attempt + 1} for solution {solution_index}"
-                        )
-                        automation.click_submit_program()
-                        time.sleep(2)
-
-                        if automation.check_passing_problem():
-                            print("Passed the problem")
-                            solution_index = (
-                                0  # Reset solution index for the next question
-                            )
-                            automation.click_next_question()
-                            time.sleep(15)
-                            submission_success = True
-                            break  # Exit the retry loop on success
-                        else:
-                            print("Submission failed. Checking for line deletion.")
-                            # TODO: Failed on Restore IP address
-                            automation.check_line_deletion(processedCode.copy())
-                            time.sleep(2)
-
-                    if not submission_success:
-                        print(
-                            f"Failed to pass the problem with solution index {solution_index}"
+    def play_unranked_game(
+        self,
+        username,
+        password,
+        session_store=None,
+        input_mode="humanlike",
+        filename="solutions.json",
+    ):
+        """Play one unranked game from login to the result banner.
+
+        Args:
+            username (str): just a valid email
+            password (str): and a valid password
+            session_store (SessionStore, optional): where the login session is kept.
+            input_mode (str, optional): one of INPUT_MODES. Defaults to "humanlike".
+            filename (str, optional): json file containing answer key. Defaults to "solutions.json".
+
+        Returns:
+            dict: won flag, problems solved, submissions and duration in seconds.
+                The per-phase timing of the game is saved under traces/.
+        """
+        started = time.perf_counter()
+        stats = {"won": False, "problems": 0, "submissions": 0, "duration": 0}
+        self.trace = GameTrace(input_mode)
+        self.trace.attach(self.driver)
+        prefetcher = SolutionPrefetcher(self, filename)
+
+        with self.trace.span("start"):
+            self.start_unranked_game(username, password, session_store)
+            self.waits.element_present(PROBLEM_TITLE_SELECTOR)
+
+        solution_index = 0  # Start with the first solution
+
+        while not self.check_winning_state(timeout=0):
+            try:
+                if solution_index == 0:
+                    self.trace.start_problem()
+                # Fetch and process the current solution
+                solution_started = time.perf_counter()
+                solution_submits = 0
+                with self.trace.span("fetch"):
+                    code = self.fetch_problem_solution(filename, solution_index, prefetcher)
+                self.trace.current["problem"] = self.current_problem
+
+                with self.trace.span("read"):
+                    self.read_and_highlight_problem(in_browser=True)
+
+                # Prepared while the judge ran the last submission, if it was predicted
+                prepared = prefetcher.take(self.current_title, solution_index, code)
+                if solution_index == 0:
+                    prefetcher.discard()
+                if prepared is not None:
+                    processedCode = prepared["lines"]
+                    keystroke_plan = prepared["plan"] if input_mode == "planned" else None
+                else:
+                    processedCode = self.process_raw_solution(code)
+                    keystroke_plan = None
+
+                # Input the solution into the editor
+                with self.trace.span("type"):
+                    self.input_code_into_editor(
+                        processedCode.copy(),
+                        input_mode=input_mode,
+                        keystroke_plan=keystroke_plan,
+                    )
+
+                # Attempt to submit up to 3 times
+                submission_success = False  # Track if submission succeeds
+                rejected = False  # The judge rejected the solution itself
+                for attempt in range(3):
+                    print(
+                        f"Submission attempt {attempt + 1} for solution {solution_index}"
+                    )
+                    with self.trace.span("submit"):
+                        self.click_submit_program()
+                        stats["submissions"] += 1
+                        solution_submits += 1
+                        if attempt == 0:
+                            # While the judge runs: the fallback candidate and the likely next problem
+                            with self.trace.span("prefetch"):
+                                prefetcher.prefetch(
+                                    self.current_title, solution_index + 1, self.current_order
+                                )
+                                prefetcher.prefetch(prefetcher.predict_next(self.current_title))
+                        result = self.watch_submission_result()
+                    solution_seconds = time.perf_counter() - solution_started
+
+                    if result["passed"]:
+                        print("Passed the problem")
+                        self.outcome_log.record(
+                            self.current_title,
+                            code,
+                            "passed",
+                            solution_submits,
+                            solution_seconds,
                         )
-                        solution_index += 1  # Move to the next solution
-
-                        # Check if we have exhausted all solutions
-                        total_solutions = len(
-                            automation.fetch_problem_solution(
-                                "solutions.json", solution_index
-                            )
-                        )  # Get the total number of solutions
-                        if solution_index >= total_solutions:
-                            print("No more solutions available. Stopping...")
-                            break  # End the game
-                except Exception as e:
-                    print(f"Encountered an exception: {e}")
-                    break  # End of game
+                        stats["problems"] += 1
+                        solution_index = 0  # Reset solution index for the next question
+                        with self.trace.span("next"):
+                            self.click_next_question()
+                            self.wait_for_next_problem(self.current_problem)
+                        submission_success = True
+                        break  # Exit the retry loop on success
+                    else:
+                        print("Submission failed. Checking for line deletion.")
+                        # TODO: Failed on Restore IP address
+                        with self.trace.span("recover"):
+                            repaired = self.repair_editor_buffer(processedCode.copy())
+                        if repaired == 0 and result["status"] == "failed":
+                            # The editor matches the solution, so the solution itself is wrong
+                            print(f"Solution rejected: {result['error']}")
+                            rejected = True
+                            break
+
+                if not submission_success:
+                    print(
+                        f"Failed to pass the problem with solution index {solution_index}"
+                    )
+                    # Failures left by a damaged editor say nothing about the solution
+                    self.outcome_log.record(
+                        self.current_title,
+                        code,
+                        "failed" if rejected else result["status"].replace("failed", "editor"),
+                        solution_submits,
+                        solution_seconds,
+                    )
+                    solution_index += 1  # Move to the next solution
+
+                    # Check if we have exhausted all solutions
+                    total_solutions = self.count_problem_solutions(
+                        filename
+                    )  # Get the total number of solutions
+                    if solution_index >= total_solutions:
+                        print("No more solutions available. Stopping...")
+                        break  # End the game
+            except Exception as e:
+                print(f"Encountered an exception: {e}")
+                break  # End of game
+
+        prefetcher.report()
+        stats["won"] = self.check_winning_state(timeout=0)
+        stats["duration"] = time.perf_counter() - started
+
+        summary = self.trace.summary(**stats)
+        self.trace.report(summary)
+        try:
+            self.trace.save(summary)
+            if self.driver_factory and self.driver_factory.profiler is not None:
+                self.driver_factory.profiler.save()
+        except Exception as e:
+            print(f"Failed to save the game trace. Error: {e}")
+        return stats
+
+
+# Example usage:
+if __name__ == "__main__":
+    load_dotenv()
+
+    automation = BeatCodeAutomation()
+    automation.setup_driver()
+
+    try:
+        automation.play_unranked_game(
+            os.getenv("USERNAME_BEATCODE"),
+            os.getenv("PASSWORD_BEATCODE"),
+            input_mode=os.getenv("INPUT_MODE_BEATCODE", "humanlike"),
+        )
     finally:
+        automation.driver_factory.report()
+        automation.page.report()
         automation.teardown_driver()
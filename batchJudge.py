@@ -0,0 +1,177 @@
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from offlineJudge import OfflineJudge
+
+
+def judge_chunk(task):
+    """Judge one solution against one chunk of tests. Runs in a pool worker.
+
+    Args:
+        task (dict): problem name, solution index, code, problem, tests, offset and limits
+
+    Returns:
+        dict: the task identity plus the OfflineJudge.run_solution result
+    """
+    judge = OfflineJudge(
+        timeout=task["timeout"],
+        test_timeout=task["test_timeout"],
+        memory_limit_mb=task["memory_limit_mb"],
+    )
+    result = judge.run_solution(task["code"], task["problem"], task["tests"])
+    result["problem_name"] = task["problem_name"]
+    result["index"] = task["index"]
+    result["offset"] = task["offset"]
+    return result
+
+
+def build_tasks(judge, chunk_size=None):
+    """Fan problems x solutions x test chunks out into independent tasks.
+
+    Args:
+        judge (OfflineJudge): provides the problems and the solution store
+        chunk_size (int, optional): tests per task. Defaults to all tests of a problem.
+
+    Returns:
+        list: task dictionaries for judge_chunk
+    """
+    problems = judge.load_problems()
+    tasks = []
+    for problem_name in judge.store.titles():
+        problem = problems.get(problem_name)
+        if problem is None:
+            continue
+        tests = judge.build_tests(problem)
+        size = chunk_size or max(len(tests), 1)
+        # Only ship what the harness needs to the workers
+        slim_problem = {"compare_func": problem["compare_func"]}
+        for index in range(judge.store.count_solutions(problem_name)):
+            code = judge.store.get_solution(problem_name, index)
+            for offset in range(0, len(tests), size):
+                chunk = tests[offset : offset + size]
+                if judge.test_timeout is None:
+                    # No per-test limit, so the chunk gets the judge's whole-solution limit
+                    timeout = judge.timeout
+                else:
+                    timeout = judge.test_timeout * len(chunk) + 5
+                tasks.append(
+                    {
+                        "problem_name": problem_name,
+                        "index": index,
+                        "code": code,
+                        "problem": slim_problem,
+                        "tests": chunk,
+                        "offset": offset,
+                        "timeout": timeout,
+                        "test_timeout": judge.test_timeout,
+                        "memory_limit_mb": judge.memory_limit_mb,
+                    }
+                )
+    return tasks
+
+
+def merge_chunks(chunks):
+    """Merge chunk results into one OfflineJudge-style result per solution.
+
+    Args:
+        chunks (list): judge_chunk results
+
+    Returns:
+        dict: problem name -> list of per-solution results
+    """
+    merged = {}
+    for chunk in sorted(chunks, key=lambda c: (c["problem_name"], c["index"], c["offset"])):
+        solutions = merged.setdefault(chunk["problem_name"], {})
+        result = solutions.setdefault(
+            chunk["index"],
+            {
+                "passed": True,
+                "passed_tests": 0,
+                "total_tests": 0,
+                "runtime": 0,
+                "wall_time": 0,
+                "failed_test": None,
+                "error": None,
+                "index": chunk["index"],
+            },
+        )
+        result["passed"] = result["passed"] and chunk["passed"]
+        result["passed_tests"] += chunk["passed_tests"]
+        result["total_tests"] += chunk["total_tests"]
+        result["runtime"] += chunk["runtime"]
+        result["wall_time"] += chunk["wall_time"]
+        if result["failed_test"] is None and chunk["failed_test"] is not None:
+            result["failed_test"] = chunk["offset"] + chunk["failed_test"]
+            result["error"] = chunk["error"]
+
+    return {
+        problem_name: [solutions[index] for index in sorted(solutions)]
+        for problem_name, solutions in merged.items()
+    }
+
+
+def run_batch(
+    output="judge_results.json",
+    workers=None,
+    chunk_size=None,
+    test_timeout=2,
+    memory_limit_mb=512,
+):
+    """Re-validate the whole corpus in parallel and write a compact results file.
+
+    Args:
+        output (str, optional): results file. Defaults to "judge_results.json".
+        workers (int, optional): pool size. Defaults to the number of cores.
+        chunk_size (int, optional): tests per task. Defaults to all tests of a problem.
+        test_timeout (float, optional): wall-clock seconds per test case. Defaults to 2.
+        memory_limit_mb (int, optional): memory cap per sandbox. Defaults to 512.
+
+    Returns:
+        dict: the merged results
+    """
+    workers = workers or os.cpu_count() or 1
+    judge = OfflineJudge(test_timeout=test_timeout, memory_limit_mb=memory_limit_mb)
+    tasks = build_tasks(judge, chunk_size)
+    total_tests = sum(len(task["tests"]) for task in tasks)
+    print(f"Judging {len(tasks)} tasks ({total_tests} tests) on {workers} workers.")
+
+    started = time.perf_counter()
+    chunks = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(judge_chunk, task) for task in tasks]
+        for future in as_completed(futures):
+            chunks.append(future.result())
+    elapsed = time.perf_counter() - started
+
+    judge.results = merge_chunks(chunks)
+    judge.save_results(output, compact=True)
+
+    solutions = [result for results in judge.results.values() for result in results]
+    passed = sum(1 for result in solutions if result["passed"])
+    print(f"{passed}/{len(solutions)} solutions passed every test.")
+    print(
+        f"Judged {total_tests} tests in {elapsed:.2f}s ({total_tests / max(elapsed, 1e-9):.1f} tests/sec)."
+    )
+    return judge.results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Validate solutions.json against the combined.json tests in parallel."
+    )
+    parser.add_argument("--output", default="judge_results.json")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--test-timeout", type=float, default=2)
+    parser.add_argument("--memory-limit-mb", type=int, default=512)
+    args = parser.parse_args()
+
+    run_batch(
+        args.output,
+        args.workers,
+        args.chunk_size,
+        args.test_timeout,
+        args.memory_limit_mb,
+    )
@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import argparse
+import tempfile
+import itertools
+from pathlib import Path
+from dotenv import load_dotenv
+
+from selenium.webdriver.common.keys import Keys
+
+from autoNavAndFill import BeatCodeAutomation, INPUT_MODES
+from driverFactory import DriverFactory
+from mockBeatCode import fixture_page
+from offlineJudge import OfflineJudge
+
+# Slower or chattier than the baseline by more than this is reported as a regression
+REGRESSION_TOLERANCE = 0.2
+
+
+class BotBenchmark:
+    def __init__(
+        self,
+        limit=None,
+        seed=0,
+        combined_filename="combined.json",
+        solutions_filename="solutions.json",
+    ):
+        """
+        Time the bot's typing, highlighting and verification on static game room pages.
+
+        Every problem of the corpus gets a fixture page (mockBeatCode.fixture_page)
+        opened over file://, so neither the network nor a server is involved, and
+        every stored solution of the problem is typed on it.
+
+        :param limit: Only use the first `limit` problems of the corpus.
+        :param seed: Typing seed, so typos land on the same keys every run.
+        :param combined_filename: The JSON file with the problem descriptions.
+        :param solutions_filename: The JSON file containing the answer key.
+        """
+        judge = OfflineJudge(combined_filename, solutions_filename)
+        problems = judge.load_problems()
+        self.store = judge.store
+        self.store.reload_if_changed()
+        self.titles = [title for title in self.store.titles() if title in problems][:limit]
+        self.cases = [
+            (title, index)
+            for title in self.titles
+            for index in range(self.store.count_solutions(title))
+        ]
+
+        self.fixture_dir = tempfile.mkdtemp(prefix="beatcode_fixtures_")
+        self.fixtures = {}
+        for number, title in enumerate(self.titles):
+            path = Path(self.fixture_dir) / f"problem_{number}.html"
+            path.write_text(fixture_page(problems[title]), encoding="utf-8")
+            self.fixtures[title] = path.as_uri()
+
+        self.automation = BeatCodeAutomation(solution_store=self.store)
+        self.automation.typing_seed = seed
+        self.headless = True
+        self.results = {}
+        self.mode_timings = {}
+
+    def open_problem(self, title):
+        """Load the fixture page of `title` and forget the element handles of the last one."""
+        self.automation.driver.get(self.fixtures[title])
+        self.automation.page.invalidate()
+
+    def solution_lines(self, title, index):
+        return self.automation.process_raw_solution(self.store.get_solution(title, index))
+
+    def measure(self, name, run, setup=None):
+        """Run `run(title, index)` on every solution, recording wall time and WebDriver commands.
+
+        Args:
+            name (str): the result key
+            run (callable): the measured call, given the problem title and solution index
+            setup (callable, optional): unmeasured preparation, given the same arguments
+        """
+        trace = self.automation.trace
+        seconds = 0.0
+        commands = 0
+        lines = 0
+        for title, index in self.cases:
+            self.open_problem(title)
+            if setup is not None:
+                setup(title, index)
+            with trace.span(name) as counters:
+                commands_before = counters["commands"]
+                started = time.perf_counter()
+                run(title, index)
+                seconds += time.perf_counter() - started
+                commands += counters["commands"] - commands_before
+            lines += len(self.solution_lines(title, index))
+
+        self.results[name] = {
+            "problems": len(self.titles),
+            "solutions": len(self.cases),
+            "lines": lines,
+            "seconds": seconds,
+            "commands": commands,
+        }
+        print(
+            f"{name}: {seconds:.2f}s, {commands} commands "
+            f"({commands / max(lines, 1):.1f} per solution line)"
+        )
+
+    def bench_typing(self, modes, typo_chances, speeds, thresholds):
+        """input_code_into_editor for every mode and typing parameter combination."""
+        for mode, typo_chance, (short, long), threshold in itertools.product(
+            modes, typo_chances, speeds, thresholds
+        ):
+            self.measure(
+                f"type[{mode},typo={typo_chance},speed={short}:{long},threshold={threshold}]",
+                lambda title, index: self.automation.input_code_into_editor(
+                    self.solution_lines(title, index),
+                    short_line_threshold=threshold,
+                    typing_speed_short=short,
+                    typing_speed_long=long,
+                    typo_chance=typo_chance,
+                    input_mode=mode,
+                ),
+            )
+
+    def bench_highlight(self, read_speeds):
+        """read_and_highlight_problem word by word over WebDriver and in the browser."""
+        for read_speed, in_browser in itertools.product(read_speeds, (False, True)):
+            where = "browser" if in_browser else "webdriver"
+            self.measure(
+                f"highlight[{where},read_speed={read_speed}]",
+                lambda title, index: self.automation.read_and_highlight_problem(
+                    read_speed, in_browser
+                ),
+            )
+
+    def bench_input_modes(self, modes):
+        """compare_input_modes on every solution: the same code typed with each mode."""
+        totals = dict.fromkeys(modes, 0.0)
+        for title, index in self.cases:
+            self.open_problem(title)
+            print(f"{title} [{index}]:")
+            timings = self.automation.compare_input_modes(
+                self.solution_lines(title, index),
+                modes,
+                typo_chance=0,
+                typing_speed_short=0,
+                typing_speed_long=0,
+            )
+            self.mode_timings[f"{title} [{index}]"] = timings
+            for mode, elapsed in timings.items():
+                totals[mode] += elapsed or 0.0
+        print("Input modes over every solution:")
+        for mode, elapsed in totals.items():
+            print(f"{mode:>10}: {elapsed:8.2f}s")
+
+    def damage_editor(self, title, index):
+        """Fill the editor with the solution and blank its second line."""
+        self.automation.input_code_into_editor(
+            self.solution_lines(title, index), input_mode="block"
+        )
+        self.automation.page.element("editor").send_keys(
+            Keys.CONTROL + Keys.HOME + Keys.NULL,
+            Keys.ARROW_DOWN,
+            Keys.SHIFT + Keys.END + Keys.NULL,
+            Keys.DELETE,
+        )
+
+    def bench_verification(self, strategies):
+        """Recovery from one blanked line, e.g. check_line_deletion or repair_editor_buffer."""
+        for strategy in strategies:
+            if strategy == "check_line_deletion" and self.headless:
+                # It copies every line through pyperclip, which has no clipboard headless
+                print("Skipping check_line_deletion: it needs a clipboard (run with --headful).")
+                continue
+            verify = getattr(self.automation, strategy)
+            self.measure(
+                f"verify[{strategy}]",
+                lambda title, index: verify(self.solution_lines(title, index)),
+                setup=self.damage_editor,
+            )
+
+    def save_baseline(self, filename="benchmark_baseline.json"):
+        with open(filename, "w") as file:
+            json.dump(self.results, file, indent=4)
+        print(f"Baseline saved to {filename}.")
+
+    def compare(self, filename="benchmark_baseline.json"):
+        """Print every result against the baseline and return the regressed ones."""
+        if not os.path.exists(filename):
+            print(f"No baseline in {filename} yet, run with --save-baseline first.")
+            return []
+        with open(filename, "r") as file:
+            baseline = json.load(file)
+
+        regressions = []
+        for name, result in self.results.items():
+            before = baseline.get(name)
+            if before is None or before.get("solutions") != result["solutions"]:
+                print(f"{name}: not in the baseline (or another corpus size)")
+                continue
+            time_change = result["seconds"] / before["seconds"] - 1 if before["seconds"] else 0
+            command_change = (
+                result["commands"] / before["commands"] - 1 if before["commands"] else 0
+            )
+            regressed = (
+                time_change > REGRESSION_TOLERANCE or command_change > REGRESSION_TOLERANCE
+            )
+            if regressed:
+                regressions.append(name)
+            print(
+                f"{'REGRESSION ' if regressed else ''}{name}: "
+                f"time {time_change:+.0%}, commands {command_change:+.0%}"
+            )
+        return regressions
+
+    def run(self, args):
+        self.headless = not args.headful
+        self.automation.setup_driver(DriverFactory(headless=self.headless))
+        try:
+            if "typing" in args.suites:
+                self.bench_typing(args.modes, args.typo_chance, args.speed, args.threshold)
+            if "modes" in args.suites:
+                self.bench_input_modes(args.modes)
+            if "highlight" in args.suites:
+                self.bench_highlight(args.read_speed)
+            if "verification" in args.suites:
+                self.bench_verification(args.strategies)
+        finally:
+            self.automation.teardown_driver()
+
+
+def parse_speed(value):
+    """Parse "short:long" typing speeds, e.g. "0.05:0.3"."""
+    short, _, long = value.partition(":")
+    return float(short), float(long or short)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark typing, highlighting and verification on local fixture pages."
+    )
+    parser.add_argument(
+        "--suites", nargs="+", default=["typing", "modes", "highlight", "verification"]
+    )
+    parser.add_argument("--limit", type=int, default=None, help="problems to use, default all")
+    parser.add_argument("--modes", nargs="+", default=list(INPUT_MODES))
+    parser.add_argument("--typo-chance", nargs="+", type=float, default=[0.0, 0.15])
+    parser.add_argument("--speed", nargs="+", type=parse_speed, default=[(0.0, 0.0)])
+    parser.add_argument("--threshold", nargs="+", type=int, default=[30])
+    parser.add_argument("--read-speed", nargs="+", type=float, default=[0.0])
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        default=["repair_editor_buffer", "check_line_deletion"],
+        help="check_line_deletion is skipped unless --headful (it needs a clipboard)",
+    )
+    parser.add_argument("--baseline", default="benchmark_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--headful", action="store_true")
+    args = parser.parse_args()
+
+    benchmark = BotBenchmark(limit=args.limit)
+    benchmark.run(args)
+    if args.save_baseline:
+        benchmark.save_baseline(args.baseline)
+    elif benchmark.compare(args.baseline):
+        raise SystemExit(1)
@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import time
+import threading
+
+
+# Frames in these files are wrappers, the call site is the code that called them
+HELPER_FILES = {"commandProfiler.py", "gameTrace.py", "gamePage.py", "pageWaits.py"}
+SELENIUM_DIR = os.sep + "selenium" + os.sep
+
+
+def call_site(frame):
+    """Return "file:function:line" of the first frame outside Selenium and the helpers."""
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if SELENIUM_DIR not in filename and os.path.basename(filename) not in HELPER_FILES:
+            return (
+                f"{os.path.basename(filename)}:{frame.f_code.co_name}:{frame.f_lineno}"
+            )
+        frame = frame.f_back
+    return "unknown"
+
+
+def instrument(driver):
+    """Wrap driver.execute once and return the list of its command listeners.
+
+    Every listener is called as listener(command, seconds, caller_frame) after each
+    command, so the game trace and the profiler share one wrapper.
+    """
+    listeners = getattr(driver, "command_listeners", None)
+    if listeners is not None:
+        return listeners
+    listeners = driver.command_listeners = []
+    execute = driver.execute
+
+    def instrumented_execute(driver_command, params=None):
+        started = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            seconds = time.perf_counter() - started
+            caller = sys._getframe(1)
+            for listener in listeners:
+                listener(driver_command, seconds, caller)
+
+    driver.execute = instrumented_execute
+    return listeners
+
+
+class CommandProfiler:
+    def __init__(self):
+        """
+        Time every WebDriver command and remember which code issued it.
+
+        Opt-in: attach it to a driver with attach(), or set PROFILE_COMMANDS_BEATCODE=1
+        so DriverFactory attaches one to every session it creates.
+        """
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def attach(self, driver):
+        """Record every command `driver` sends from now on."""
+        instrument(driver).append(self.on_command)
+
+    def on_command(self, command, seconds, caller):
+        self.record(command, seconds, call_site(caller))
+
+    def record(self, command, latency, site):
+        with self.lock:
+            entry = self.calls.setdefault(
+                (command, site), {"count": 0, "seconds": 0.0, "max": 0.0}
+            )
+            entry["count"] += 1
+            entry["seconds"] += latency
+            entry["max"] = max(entry["max"], latency)
+
+    def by_command(self):
+        """Return {command: {"count", "seconds"}} summed over every call site."""
+        totals = {}
+        with self.lock:
+            for (command, _), entry in self.calls.items():
+                total = totals.setdefault(command, {"count": 0, "seconds": 0.0})
+                total["count"] += entry["count"]
+                total["seconds"] += entry["seconds"]
+        return totals
+
+    def top(self, count=15):
+        """Return the `count` most expensive (command, call site) pairs by total time."""
+        with self.lock:
+            entries = [
+                {"command": command, "call_site": site, **entry}
+                for (command, site), entry in self.calls.items()
+            ]
+        entries.sort(key=lambda entry: -entry["seconds"])
+        return entries[:count]
+
+    def report(self, count=15):
+        """Print the totals per command and the top call sites."""
+        totals = self.by_command()
+        calls = sum(total["count"] for total in totals.values())
+        seconds = sum(total["seconds"] for total in totals.values())
+        elapsed = time.perf_counter() - self.started
+        print(
+            f"{calls} WebDriver commands took {seconds:.1f}s "
+            f"({seconds / elapsed:.0%} of {elapsed:.1f}s profiled)."
+        )
+        for command, total in sorted(totals.items(), key=lambda item: -item[1]["seconds"]):
+            print(f"    {command:<28} {total['count']:6} calls {total['seconds']:8.2f}s")
+
+        print(f"Top {count} call sites:")
+        for entry in self.top(count):
+            mean = entry["seconds"] / entry["count"] * 1000
+            print(
+                f"    {entry['seconds']:8.2f}s {entry['count']:6} x {mean:6.1f}ms "
+                f"(max {entry['max'] * 1000:.0f}ms)  {entry['command']:<24} {entry['call_site']}"
+            )
+
+    def save(self, filename="command_profile.json"):
+        """Write every (command, call site) entry, most expensive first."""
+        with open(filename, "w") as file:
+            json.dump(
+                {"by_command": self.by_command(), "calls": self.top(len(self.calls))},
+                file,
+                indent=4,
+            )
+        print(f"Command profile saved to {filename}.")
@@ -0,0 +1,184 @@
+import os
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from commandProfiler import CommandProfiler
+
+try:
+    import psutil  # Optional, only needed for the memory figures
+except ImportError:
+    psutil = None
+
+
+# Fonts are blocked at the network layer; images through the content settings
+BLOCKED_FONT_URLS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.googleapis.com*"]
+
+
+class DriverFactory:
+    def __init__(
+        self,
+        driver_path=None,
+        headless=False,
+        block_images=False,
+        block_fonts=False,
+        page_load_strategy="normal",
+        user_data_dir=None,
+        window_size=(1280, 900),
+        debugger_address=None,
+        profile_commands=False,
+    ):
+        """
+        Build Chrome sessions for both the bot and the scraper.
+
+        :param driver_path: Path to the ChromeDriver. Defaults to CHROME_DRIVER_PATH.
+        :param headless: Run Chrome without a window.
+        :param block_images: Do not download images.
+        :param block_fonts: Do not download web fonts.
+        :param page_load_strategy: "normal", "eager" (DOM ready) or "none".
+        :param user_data_dir: Chrome profile directory kept between runs (login cookies).
+        :param window_size: (width, height) of the browser window.
+        :param debugger_address: "host:port" of an already running Chrome started with
+            --remote-debugging-port. The browser is attached to instead of launched.
+        :param profile_commands: Time every WebDriver command of the created sessions
+            with a shared CommandProfiler (see self.profiler).
+        """
+        self.driver_path = driver_path or os.getenv("CHROME_DRIVER_PATH")
+        self.headless = headless
+        self.block_images = block_images
+        self.block_fonts = block_fonts
+        self.page_load_strategy = page_load_strategy
+        self.user_data_dir = user_data_dir
+        self.window_size = window_size
+        self.debugger_address = debugger_address
+        self.metrics = []
+        self.profiler = CommandProfiler() if profile_commands else None
+
+    @classmethod
+    def from_env(cls, **overrides):
+        """Build a factory from the .env settings, e.g. HEADLESS_BEATCODE=1."""
+
+        def flag(name):
+            return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+        settings = {
+            "headless": flag("HEADLESS_BEATCODE"),
+            "block_images": flag("BLOCK_IMAGES_BEATCODE"),
+            "block_fonts": flag("BLOCK_FONTS_BEATCODE"),
+            "page_load_strategy": os.getenv("PAGE_LOAD_STRATEGY_BEATCODE", "normal"),
+            "user_data_dir": os.getenv("CHROME_USER_DATA_DIR") or None,
+            "debugger_address": os.getenv("CHROME_DEBUGGER_ADDRESS") or None,
+            "profile_commands": flag("PROFILE_COMMANDS_BEATCODE"),
+        }
+        settings.update(overrides)
+        return cls(**settings)
+
+    def build_options(self):
+        """Translate the factory settings into ChromeOptions."""
+        options = webdriver.ChromeOptions()
+        options.page_load_strategy = self.page_load_strategy
+        if self.debugger_address:
+            # The running browser keeps its own flags and profile
+            options.debugger_address = self.debugger_address
+            return options
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--disable-gpu")
+        options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--no-first-run")
+        options.add_argument("--no-default-browser-check")
+        options.add_argument("--disable-dev-shm-usage")
+        if self.user_data_dir:
+            options.add_argument(f"--user-data-dir={os.path.abspath(self.user_data_dir)}")
+        if self.block_images:
+            options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+        return options
+
+    def create(self):
+        """Start a Chrome session and record its startup time.
+
+        Returns:
+            WebDriver: the new driver
+        """
+        started = time.perf_counter()
+        driver = webdriver.Chrome(
+            service=Service(self.driver_path), options=self.build_options()
+        )
+        if self.block_fonts:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_FONT_URLS})
+        if self.profiler is not None:
+            self.profiler.attach(driver)
+        startup = time.perf_counter() - started
+
+        self.metrics.append({"driver": driver, "startup": startup, "page_loads": []})
+        print(f"Chrome started in {startup:.2f}s.")
+        return driver
+
+    def measure_page_load(self, driver, url):
+        """Open `url` and record how long the navigation took.
+
+        Returns:
+            float: seconds until the page load strategy let driver.get return
+        """
+        started = time.perf_counter()
+        driver.get(url)
+        elapsed = time.perf_counter() - started
+        for metric in self.metrics:
+            if metric["driver"] is driver:
+                metric["page_loads"].append((url, elapsed))
+        return elapsed
+
+    def browser_rss(self, driver):
+        """Resident memory in MB of chromedriver and every Chrome process under it."""
+        if psutil is None:
+            return None
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(process.memory_info().rss for process in processes) / 2**20
+        except Exception as e:
+            print(f"Failed to read browser memory. Error: {e}")
+            return None
+
+    def report(self):
+        """Print startup time, memory and page-load latency of every session."""
+        for number, metric in enumerate(self.metrics):
+            rss = self.browser_rss(metric["driver"])
+            rss_text = f"{rss:.0f} MB" if rss is not None else "n/a (install psutil)"
+            print(f"Session {number}: startup {metric['startup']:.2f}s, RSS {rss_text}")
+            for url, elapsed in metric["page_loads"]:
+                print(f"    {elapsed:.2f}s  {url}")
+        if self.profiler is not None:
+            self.profiler.report()
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    # Compare the default profile against the lightweight one on the same page
+    for label, factory in (
+        ("default", DriverFactory()),
+        (
+            "lightweight",
+            DriverFactory(
+                headless=True,
+                block_images=True,
+                block_fonts=True,
+                page_load_strategy="eager",
+            ),
+        ),
+    ):
+        print(f"== {label} ==")
+        driver = factory.create()
+        try:
+            factory.measure_page_load(driver, "https://www.beatcode.dev/home")
+            factory.report()
+        finally:
+            driver.quit()
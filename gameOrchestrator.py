@@ -0,0 +1,255 @@
+import os
+import json
+import time
+import queue
+import argparse
+import multiprocessing
+from dotenv import load_dotenv
+
+from autoNavAndFill import BeatCodeAutomation
+from driverFactory import DriverFactory
+from sessionStore import SessionStore
+from solutionStore import SolutionStore
+
+try:
+    import psutil  # Optional, only needed for the CPU and memory caps
+except ImportError:
+    psutil = None
+
+
+def load_accounts(filename="accounts.json"):
+    """Load the worker accounts.
+
+    The file is a list of {"username", "password"} objects, optionally with
+    "session_file" and "user_data_dir". Falls back to the single .env account.
+    """
+    if os.path.exists(filename):
+        with open(filename, "r") as file:
+            return json.load(file)
+    return [
+        {
+            "username": os.getenv("USERNAME_BEATCODE"),
+            "password": os.getenv("PASSWORD_BEATCODE"),
+        }
+    ]
+
+
+def game_worker(
+    worker_id, account, store, results, throttle, max_games, input_mode, games_played=0
+):
+    """Play games back to back in one process with its own browser.
+
+    Args:
+        worker_id (int): number of the worker, used for logs and file names
+        account (dict): the credentials of this worker
+        store (SolutionStore): solution store loaded by the parent (shared copy-on-write)
+        results (multiprocessing.Queue): where every game's stats are reported
+        throttle (multiprocessing.Event): set by the supervisor while the host is over its caps
+        max_games (int): games to play before exiting, 0 for no limit
+        input_mode (str): one of INPUT_MODES
+        games_played (int, optional): games this worker reported before it was restarted,
+            they count towards max_games. Defaults to 0.
+    """
+    session_store = SessionStore(
+        account.get("session_file", f"session_{worker_id}.json")
+    )
+    factory = DriverFactory.from_env(
+        user_data_dir=account.get("user_data_dir"),
+        # Attaching would make every worker share one browser
+        debugger_address=None,
+    )
+
+    games = games_played
+    while not max_games or games < max_games:
+        while throttle.is_set():
+            time.sleep(1)
+
+        automation = BeatCodeAutomation(solution_store=store)
+        automation.setup_driver(factory)
+        try:
+            stats = automation.play_unranked_game(
+                account["username"],
+                account["password"],
+                session_store=session_store,
+                input_mode=input_mode,
+            )
+        finally:
+            automation.teardown_driver()
+
+        stats["worker"] = worker_id
+        results.put(stats)
+        games += 1
+
+
+class GameOrchestrator:
+    def __init__(
+        self,
+        accounts,
+        workers=None,
+        max_games=0,
+        max_restarts=3,
+        cpu_cap=90,
+        memory_cap=90,
+        input_mode="humanlike",
+    ):
+        """
+        Run several BeatCodeAutomation workers in separate processes.
+
+        :param accounts: Credentials, one per worker (reused round-robin if there are fewer).
+        :param workers: Number of worker processes. Defaults to the number of accounts.
+        :param max_games: Games per worker, 0 to keep playing until interrupted.
+        :param max_restarts: How often a crashed worker is restarted.
+        :param cpu_cap: Host CPU percent above which workers pause before their next game.
+        :param memory_cap: Host memory percent above which workers pause before their next game.
+        :param input_mode: One of INPUT_MODES.
+        """
+        self.accounts = accounts
+        self.workers = workers or len(accounts)
+        self.max_games = max_games
+        self.max_restarts = max_restarts
+        self.cpu_cap = cpu_cap
+        self.memory_cap = memory_cap
+        self.input_mode = input_mode
+        self.results = multiprocessing.Queue()
+        self.throttle = multiprocessing.Event()
+        self.games = []
+        self.samples = []
+        self.restarts = {}
+        # Loaded once here; forked workers share the pages until they write to them
+        self.store = SolutionStore()
+        self.store.reload_if_changed()
+
+    def games_played(self, worker_id):
+        """Return how many games a worker has reported so far."""
+        return sum(1 for game in self.games if game["worker"] == worker_id)
+
+    def start_worker(self, worker_id):
+        """Start (or restart) one worker process, with the games it has left."""
+        process = multiprocessing.Process(
+            target=game_worker,
+            args=(
+                worker_id,
+                self.accounts[worker_id % len(self.accounts)],
+                self.store,
+                self.results,
+                self.throttle,
+                self.max_games,
+                self.input_mode,
+                self.games_played(worker_id),
+            ),
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def check_host(self):
+        """Sample host CPU and memory and pause the workers while over the caps."""
+        if psutil is None:
+            return
+        cpu = psutil.cpu_percent(interval=None)
+        memory = psutil.virtual_memory().percent
+        self.samples.append((len(self.games), cpu, memory))
+        if cpu > self.cpu_cap or memory > self.memory_cap:
+            if not self.throttle.is_set():
+                print(f"Host over its caps (CPU {cpu:.0f}%, memory {memory:.0f}%), pausing new games.")
+            self.throttle.set()
+        elif self.throttle.is_set():
+            print("Host back under its caps, resuming.")
+            self.throttle.clear()
+
+    def drain_results(self):
+        """Move finished game stats from the queue into self.games."""
+        while True:
+            try:
+                self.games.append(self.results.get_nowait())
+            except queue.Empty:
+                return
+
+    def run(self, poll_interval=5):
+        """Supervise the workers until they are done or Ctrl+C is pressed."""
+        started = time.perf_counter()
+        processes = {worker_id: self.start_worker(worker_id) for worker_id in range(self.workers)}
+        try:
+            while processes:
+                time.sleep(poll_interval)
+                self.drain_results()
+                self.check_host()
+
+                for worker_id, process in list(processes.items()):
+                    if process.is_alive():
+                        continue
+                    if process.exitcode == 0:
+                        del processes[worker_id]
+                        continue
+                    restarts = self.restarts.get(worker_id, 0)
+                    if restarts >= self.max_restarts:
+                        print(f"Worker {worker_id} crashed too often, giving up on it.")
+                        del processes[worker_id]
+                        continue
+                    print(f"Worker {worker_id} crashed (exit code {process.exitcode}), restarting.")
+                    self.restarts[worker_id] = restarts + 1
+                    # Its last results may still be in the queue
+                    self.drain_results()
+                    processes[worker_id] = self.start_worker(worker_id)
+        except KeyboardInterrupt:
+            print("Stopping workers.")
+            for process in processes.values():
+                process.terminate()
+            for process in processes.values():
+                process.join()
+
+        self.drain_results()
+        return self.report(time.perf_counter() - started)
+
+    def report(self, elapsed):
+        """Print games/hour, win rate and the host load seen while running."""
+        games = len(self.games)
+        wins = sum(1 for game in self.games if game["won"])
+        summary = {
+            "workers": self.workers,
+            "games": games,
+            "wins": wins,
+            "win_rate": wins / games if games else 0,
+            "games_per_hour": games / elapsed * 3600 if elapsed else 0,
+            "restarts": sum(self.restarts.values()),
+        }
+        if self.samples:
+            summary["peak_cpu"] = max(sample[1] for sample in self.samples)
+            summary["peak_memory"] = max(sample[2] for sample in self.samples)
+
+        print(
+            f"{summary['workers']} workers: {games} games, win rate {summary['win_rate']:.0%}, "
+            f"{summary['games_per_hour']:.1f} games/hour, {summary['restarts']} restarts."
+        )
+        if self.samples:
+            print(
+                f"Peak host load: CPU {summary['peak_cpu']:.0f}%, memory {summary['peak_memory']:.0f}%."
+            )
+        else:
+            print("Host load not sampled (install psutil for the CPU and memory caps).")
+        return summary
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Play BeatCode games with several bots at once.")
+    parser.add_argument("--accounts", default="accounts.json")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--games", type=int, default=0, help="games per worker, 0 = no limit")
+    parser.add_argument("--max-restarts", type=int, default=3)
+    parser.add_argument("--cpu-cap", type=float, default=90)
+    parser.add_argument("--memory-cap", type=float, default=90)
+    parser.add_argument("--input-mode", default=os.getenv("INPUT_MODE_BEATCODE", "humanlike"))
+    args = parser.parse_args()
+
+    orchestrator = GameOrchestrator(
+        load_accounts(args.accounts),
+        workers=args.workers,
+        max_games=args.games,
+        max_restarts=args.max_restarts,
+        cpu_cap=args.cpu_cap,
+        memory_cap=args.memory_cap,
+        input_mode=args.input_mode,
+    )
+    orchestrator.run()
@@ -0,0 +1,131 @@
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import StaleElementReferenceException
+
+
+PROBLEM_TITLE_SELECTOR = "h2.mb-2.text-2xl.font-semibold"
+WINNING_STATE_SELECTOR = "div.mb-10.font-icon.text-5xl.font-bold"
+SUBMIT_BUTTON_SELECTOR = "button.ring-offset-background.focus-visible\\:ring-ring.inline-flex.justify-center.gap-2"
+PROBLEM_CONTAINER_SELECTOR = "div.h-full.overflow-y-auto.bg-background.px-4.py-5 > div:nth-child(3)"
+EDITOR_SELECTOR = "div[role='textbox']"
+NEXT_QUESTION_SELECTOR = "button.ring-offset-background.focus-visible\\:ring-ring.inline-flex.justify-center.h-10"
+# Panel showing the judge output below the editor; the page body is the fallback
+TEST_RESULT_SELECTOR = "div[role='tabpanel']"
+
+# Elements of the game room that GamePage caches, by name
+GAME_ELEMENTS = {
+    "problem_title": PROBLEM_TITLE_SELECTOR,
+    "problem_container": PROBLEM_CONTAINER_SELECTOR,
+    "editor": EDITOR_SELECTOR,
+    "submit_button": SUBMIT_BUTTON_SELECTOR,
+    "next_button": NEXT_QUESTION_SELECTOR,
+}
+
+
+class GamePage:
+    def __init__(self, driver, timeout=10, elements=None):
+        """
+        Page object of the game room that caches element handles between calls.
+
+        A cached handle is reused until the page navigates (invalidate) or
+        Selenium reports it stale, so the submit/retry loop does not pay a
+        find_element round-trip per attempt.
+
+        :param driver: The Selenium WebDriver.
+        :param timeout: Maximum seconds to wait for an element that is not cached yet.
+        :param elements: Name -> CSS selector map. Defaults to GAME_ELEMENTS.
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.elements = elements or GAME_ELEMENTS
+        self.handles = {}
+        self.stats = {
+            name: {"lookups": 0, "hits": 0, "stale": 0, "seconds": 0.0}
+            for name in self.elements
+        }
+
+    def element(self, name, clickable=False, timeout=None):
+        """Return the element called `name`, from the cache when possible.
+
+        Args:
+            name (str): a key of self.elements
+            clickable (bool, optional): also wait until it is displayed and enabled. Defaults to False.
+            timeout (float, optional): seconds to wait. Defaults to self.timeout.
+
+        Returns:
+            WebElement: the element
+        """
+        stats = self.stats[name]
+        stats["lookups"] += 1
+        started = time.perf_counter()
+        try:
+            wait = WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=0.1)
+            cached = self.handles.get(name)
+            if cached is not None:
+                if not clickable:
+                    stats["hits"] += 1
+                    return cached
+                try:
+                    # Same check as for a fresh lookup, minus the find_element
+                    wait.until(EC.element_to_be_clickable(cached))
+                    stats["hits"] += 1
+                    return cached
+                except StaleElementReferenceException:
+                    stats["stale"] += 1
+                    self.handles.pop(name, None)
+
+            locator = (By.CSS_SELECTOR, self.elements[name])
+            if clickable:
+                element = wait.until(EC.element_to_be_clickable(locator))
+            else:
+                element = wait.until(EC.presence_of_element_located(locator))
+            self.handles[name] = element
+            return element
+        finally:
+            stats["seconds"] += time.perf_counter() - started
+
+    def run(self, name, action, clickable=False, timeout=None):
+        """Call `action(element)`, looking the element up again once if it went stale."""
+        try:
+            return action(self.element(name, clickable, timeout))
+        except StaleElementReferenceException:
+            self.stats[name]["stale"] += 1
+            self.invalidate(name)
+            return action(self.element(name, clickable, timeout))
+
+    def click(self, name, timeout=None):
+        """Click the element called `name` once it is clickable."""
+        self.run(name, lambda element: element.click(), clickable=True, timeout=timeout)
+
+    def focus(self, name, timeout=None):
+        """Click the element called `name` and return it, e.g. before typing into the editor."""
+
+        def click_and_return(element):
+            element.click()
+            return element
+
+        return self.run(name, click_and_return, timeout=timeout)
+
+    def text(self, name, timeout=None):
+        """Return the visible text of the element called `name`."""
+        return self.run(name, lambda element: element.text, timeout=timeout)
+
+    def invalidate(self, *names):
+        """Drop the cached handles (all of them when no name is given), e.g. after navigation."""
+        if not names:
+            self.handles.clear()
+        for name in names:
+            self.handles.pop(name, None)
+
+    def report(self):
+        """Print how often each element was looked up, served from cache and went stale."""
+        for name, stats in self.stats.items():
+            if not stats["lookups"]:
+                continue
+            print(
+                f"{name}: {stats['lookups']} lookups, {stats['hits']} cached, "
+                f"{stats['stale']} stale, {stats['seconds']:.2f}s"
+            )
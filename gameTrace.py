@@ -0,0 +1,177 @@
+import os
+import csv
+import json
+import time
+from contextlib import contextmanager
+
+from commandProfiler import instrument
+
+try:
+    import fcntl  # POSIX only, serialises traces.csv appends between bot processes
+except ImportError:
+    fcntl = None
+
+
+class GameTrace:
+    def __init__(self, input_mode=None):
+        """
+        Per-phase timing and WebDriver command counts for one game.
+
+        Time, commands and sleeps go to the innermost open span of the current
+        problem. A parent span's seconds include its nested spans, its commands
+        and sleeps do not.
+
+        :param input_mode: Recorded with the summary so runs can be compared.
+        """
+        self.input_mode = input_mode
+        self.started = time.time()
+        self.started_counter = time.perf_counter()
+        self.stack = []
+        # Everything before the first problem (login, lobby) is in this record
+        self.game = self.new_record("(game)")
+        self.problems = []
+        self.current = self.game
+        self.commands = 0
+
+    def new_record(self, problem):
+        return {"problem": problem, "phases": {}}
+
+    def phase(self, name):
+        """Return the counters of phase `name` of the current problem."""
+        return self.current["phases"].setdefault(
+            name, {"seconds": 0.0, "commands": 0, "sleep": 0.0, "calls": 0}
+        )
+
+    def start_problem(self, title=None):
+        """Start a new per-problem record; the title can be filled in later."""
+        self.current = self.new_record(title)
+        self.problems.append(self.current)
+        return self.current
+
+    @contextmanager
+    def span(self, name):
+        """Time the block as phase `name`, e.g. `with trace.span("type"): ...`."""
+        self.stack.append(name)
+        counters = self.phase(name)
+        counters["calls"] += 1
+        started = time.perf_counter()
+        try:
+            yield counters
+        finally:
+            counters["seconds"] += time.perf_counter() - started
+            self.stack.pop()
+
+    def sleep(self, seconds):
+        """time.sleep that also books the pause on the current phase."""
+        time.sleep(seconds)
+        if self.stack:
+            self.phase(self.stack[-1])["sleep"] += seconds
+
+    def attach(self, driver):
+        """Count every WebDriver command `driver` sends from now on.
+
+        Re-attaching a new trace to the same driver replaces the old counter. The
+        driver.execute wrapper is shared with CommandProfiler (see instrument).
+        """
+        listeners = instrument(driver)
+        previous = getattr(driver, "trace_listener", None)
+        if previous in listeners:
+            listeners.remove(previous)
+
+        def count_command(driver_command, seconds, caller):
+            self.commands += 1
+            if self.stack:
+                self.phase(self.stack[-1])["commands"] += 1
+
+        driver.trace_listener = count_command
+        listeners.append(count_command)
+
+    def summary(self, **extra):
+        """Return the whole game as a JSON-serialisable dict.
+
+        Args:
+            **extra: values added at the top level, e.g. the game stats
+
+        Returns:
+            dict: started, duration, commands, phase totals and the per-problem records
+        """
+        totals = {}
+        for record in [self.game] + self.problems:
+            for name, counters in record["phases"].items():
+                total = totals.setdefault(
+                    name, {"seconds": 0.0, "commands": 0, "sleep": 0.0, "calls": 0}
+                )
+                for key, value in counters.items():
+                    total[key] += value
+
+        summary = {
+            "started": self.started,
+            "input_mode": self.input_mode,
+            "duration": time.perf_counter() - self.started_counter,
+            "commands": self.commands,
+            "phases": totals,
+            "problems": [self.game] + self.problems,
+        }
+        summary.update(extra)
+        return summary
+
+    def save(self, summary, directory="traces"):
+        """Write the summary as trace_<started>_<pid>.json and append its rows to traces.csv.
+
+        The pid keeps the files of orchestrated workers apart, and the CSV rows of
+        one game are appended under a file lock.
+
+        Args:
+            summary (dict): the output of self.summary()
+            directory (str, optional): where the traces are kept. Defaults to "traces".
+
+        Returns:
+            str: the path of the JSON file
+        """
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, f"trace_{int(self.started)}_{os.getpid()}.json")
+        with open(json_path, "w") as file:
+            json.dump(summary, file, indent=4)
+
+        csv_path = os.path.join(directory, "traces.csv")
+        with open(csv_path, "a", newline="") as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            # Decided under the lock, so only the first writer adds the header
+            file.seek(0, os.SEEK_END)
+            writer = csv.writer(file)
+            if file.tell() == 0:
+                writer.writerow(
+                    ["started", "input_mode", "problem", "phase", "calls", "seconds", "sleep", "commands"]
+                )
+            for record in summary["problems"]:
+                for name, counters in record["phases"].items():
+                    writer.writerow(
+                        [
+                            int(self.started),
+                            self.input_mode,
+                            record["problem"],
+                            name,
+                            counters["calls"],
+                            round(counters["seconds"], 3),
+                            round(counters["sleep"], 3),
+                            counters["commands"],
+                        ]
+                    )
+        print(f"Game trace saved to {json_path}.")
+        return json_path
+
+    def report(self, summary=None):
+        """Print where the game's wall-clock time and WebDriver commands went."""
+        summary = summary or self.summary()
+        duration = summary["duration"]
+        print(f"Game took {duration:.1f}s and {summary['commands']} WebDriver commands.")
+        for name, counters in sorted(
+            summary["phases"].items(), key=lambda item: -item[1]["seconds"]
+        ):
+            share = counters["seconds"] / duration if duration else 0
+            print(
+                f"    {name:<8} {counters['seconds']:7.1f}s ({share:4.0%})  "
+                f"sleep {counters['sleep']:6.1f}s  {counters['commands']:5} commands  "
+                f"{counters['calls']} calls"
+            )
@@ -0,0 +1,86 @@
+import random
+
+from selenium.webdriver.common.keys import Keys
+
+
+class KeystrokePlanner:
+    def __init__(
+        self,
+        typo_chance=0.15,
+        typing_speed_short=0.05,
+        typing_speed_long=0.3,
+        short_line_threshold=30,
+        seed=None,
+    ):
+        """
+        Turn lines of code into humanlike keystroke schedules ahead of time.
+
+        :param typo_chance: Chance to insert a typo (and its backspace) before a character.
+        :param typing_speed_short: Lower bound of the pause between characters.
+        :param typing_speed_long: Upper bound of the pause between characters.
+        :param short_line_threshold: Lines up to this length use the short typing speed.
+        :param seed: Seed for the random generator, so a schedule can be reproduced.
+        """
+        self.typo_chance = typo_chance
+        self.typing_speed_short = typing_speed_short
+        self.typing_speed_long = typing_speed_long
+        self.short_line_threshold = short_line_threshold
+        self.random = random.Random(seed)
+
+    def plan_line(self, line):
+        """Plan the keystrokes needed to type one line of the solution.
+
+        Mirrors input_code_into_editor + typing_code_into_editor: clear the
+        auto indent, type each character (sometimes with a typo first), add a
+        trailing space, drop auto-closed docstring quotes and press return.
+
+        Args:
+            line (str): the line of code
+
+        Returns:
+            list: (key, pause, modifier) tuples, modifier is None for plain keys
+        """
+        typing_speed = (
+            self.typing_speed_short
+            if len(line.strip()) <= self.short_line_threshold
+            else self.typing_speed_long
+        )
+
+        plan = [(Keys.BACKSPACE, 0, Keys.CONTROL)]
+        for char in line:
+            if self.random.random() < self.typo_chance:
+                typo_char = self.random.choice("abcdefghijklmnopqrstuvwxyz")
+                plan.append((typo_char, typing_speed, None))
+                plan.append((Keys.BACKSPACE, typing_speed, None))
+            plan.append(
+                (
+                    char,
+                    self.random.uniform(
+                        self.typing_speed_short, self.typing_speed_long
+                    ),
+                    None,
+                )
+            )
+        # Handle comment out case:
+        plan.append((Keys.SPACE, 0, None))
+        if line.startswith('"""') or line.startswith("'''"):
+            plan.append((Keys.DELETE, 0, Keys.CONTROL))
+        key, _, modifier = plan[-1]
+        plan[-1] = (key, typing_speed, modifier)
+        plan.append((Keys.RETURN, 0, None))
+        return plan
+
+    def plan_code(self, code):
+        """Plan every line of a processed solution.
+
+        Args:
+            code (list): the lines of the solution code
+
+        Returns:
+            list: one keystroke schedule per line
+        """
+        return [self.plan_line(line) for line in code]
+
+    def plan_duration(self, plan):
+        """Return the total pause time in seconds of a line schedule."""
+        return sum(pause for _, pause, _ in plan)
@@ -0,0 +1,483 @@
+import json
+import time
+import random
+import secrets
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from offlineJudge import OfflineJudge
+from solutionStore import SolutionStore
+
+
+LOGIN_PAGE = """<!doctype html>
+<html><head><title>Login - BeatCode (mock)</title></head>
+<body>
+<form method="post" action="/login">
+    <input name="username" type="email" placeholder="Email">
+    <input name="password" type="password" placeholder="Password">
+    <button type="submit">Log in</button>
+</form>
+</body></html>
+"""
+
+HOME_PAGE = """<!doctype html>
+<html><head><title>Home - BeatCode (mock)</title></head>
+<body>
+<nav>
+    <a href="/solo/unranked">Unranked</a>
+    <a href="/custom">Custom</a>
+</nav>
+</body></html>
+"""
+
+# Same selectors as the real game room (see gamePage.py). The editor keeps its text
+# in one text node and answers beforeinput itself: Enter auto-indents, Ctrl+Backspace
+# drops the indentation, like CodeMirror. It exposes the buffer through cmView too.
+GAME_PAGE = """<!doctype html>
+<html><head><title>Game - BeatCode (mock)</title>
+<style>
+    body { font-family: sans-serif; display: flex; gap: 1rem; margin: 0; }
+    .bg-background { width: 45%; height: 100vh; }
+    #editor { white-space: pre; font-family: monospace; min-height: 60vh;
+              border: 1px solid #888; padding: 4px; overflow: auto; }
+    button:disabled { opacity: 0.5; }
+</style></head>
+<body>
+<div class="h-full overflow-y-auto bg-background px-4 py-5" id="problem">
+    <h2 class="mb-2 text-2xl font-semibold" id="title"></h2>
+    <div id="difficulty"></div>
+    <div id="description"></div>
+</div>
+<div id="workspace" style="width: 55%;">
+    <div role="textbox" contenteditable="true" spellcheck="false" id="editor"></div>
+    <button class="ring-offset-background focus-visible:ring-ring inline-flex justify-center gap-2"
+            id="submit">Submit</button>
+    <div role="tabpanel" id="result"></div>
+</div>
+<script>
+const gameUrl = "/api" + location.pathname;
+const editor = document.getElementById("editor");
+let text = "";
+let submissions = 0;
+
+editor.cmView = {view: {state: {doc: {toString: () => text}}}};
+
+function position(node, offset) {
+    if (node.nodeType === Node.TEXT_NODE) return offset;
+    return offset === 0 ? 0 : text.length;
+}
+
+function selection() {
+    const current = window.getSelection();
+    if (!current.rangeCount) return [text.length, text.length];
+    const range = current.getRangeAt(0);
+    const start = position(range.startContainer, range.startOffset);
+    const end = position(range.endContainer, range.endOffset);
+    return [Math.min(start, end), Math.max(start, end)];
+}
+
+function render(caret) {
+    editor.textContent = text;
+    // A trailing line break only gets a line box with an element after it
+    if (text.endsWith("\\n")) editor.appendChild(document.createElement("br"));
+    const range = document.createRange();
+    if (editor.firstChild && editor.firstChild.nodeType === Node.TEXT_NODE) {
+        range.setStart(editor.firstChild, caret);
+    } else {
+        range.setStart(editor, 0);
+    }
+    range.collapse(true);
+    const current = window.getSelection();
+    current.removeAllRanges();
+    current.addRange(range);
+}
+
+function replace(start, end, inserted) {
+    text = text.slice(0, start) + inserted + text.slice(end);
+    render(start + inserted.length);
+}
+
+function lineStart(offset) {
+    return text.lastIndexOf("\\n", offset - 1) + 1;
+}
+
+function lineEnd(offset) {
+    const end = text.indexOf("\\n", offset);
+    return end === -1 ? text.length : end;
+}
+
+function groupBackward(offset) {
+    const start = lineStart(offset);
+    if (offset === start) return Math.max(0, offset - 1);
+    const before = text.slice(start, offset);
+    const group = before.match(/(\\s+|\\w+|[^\\w\\s]+)$/)[0];
+    return offset - group.length;
+}
+
+function groupForward(offset) {
+    // Nothing to eat at the line end: quotes are not auto-closed here
+    const after = text.slice(offset, lineEnd(offset));
+    if (!after) return offset;
+    return offset + after.match(/^(\\s+|\\w+|[^\\w\\s]+)/)[0].length;
+}
+
+editor.addEventListener("beforeinput", (event) => {
+    const [start, end] = selection();
+    const type = event.inputType;
+    event.preventDefault();
+    if (type === "insertText" || type === "insertReplacementText") {
+        replace(start, end, event.data || "");
+    } else if (type === "insertFromPaste" || type === "insertFromDrop") {
+        replace(start, end, event.dataTransfer.getData("text/plain"));
+    } else if (type === "insertParagraph" || type === "insertLineBreak") {
+        const line = text.slice(lineStart(start), start);
+        let indent = line.match(/^\\s*/)[0];
+        if (line.trimEnd().endsWith(":")) indent += "    ";
+        replace(start, end, "\\n" + indent);
+    } else if (start !== end && type.startsWith("delete")) {
+        replace(start, end, "");
+    } else if (type === "deleteContentBackward") {
+        replace(Math.max(0, start - 1), start, "");
+    } else if (type === "deleteContentForward") {
+        replace(start, Math.min(text.length, start + 1), "");
+    } else if (type === "deleteWordBackward") {
+        replace(groupBackward(start), start, "");
+    } else if (type === "deleteWordForward") {
+        replace(start, groupForward(start), "");
+    } else if (type === "deleteSoftLineBackward" || type === "deleteHardLineBackward") {
+        replace(lineStart(start), start, "");
+    } else if (type === "deleteSoftLineForward" || type === "deleteHardLineForward") {
+        replace(start, lineEnd(start), "");
+    }
+});
+
+editor.addEventListener("keydown", (event) => {
+    if (event.key === "Tab") {
+        event.preventDefault();
+        const [start, end] = selection();
+        replace(start, end, "    ");
+    }
+});
+
+// execCommand("insertText") edits the DOM without a beforeinput; re-read it
+editor.addEventListener("input", () => {
+    text = editor.innerText.replace(/\\u00a0/g, " ");
+    render(text.length);
+});
+
+function showProblem(state) {
+    if (state.status === "won") {
+        document.body.innerHTML =
+            '<div class="mb-10 font-icon text-5xl font-bold">You won!</div>' +
+            "<p>Solved " + state.total + " problems.</p>";
+        return;
+    }
+    document.getElementById("title").textContent = state.title;
+    document.getElementById("difficulty").textContent = state.difficulty;
+    document.getElementById("description").innerHTML = state.description;
+    document.getElementById("result").textContent = "";
+    const next = document.getElementById("next");
+    if (next) next.remove();
+    text = state.boilerplate || "";
+    editor.textContent = text;
+}
+
+async function call(path, body) {
+    const response = await fetch(gameUrl + path, {
+        method: body === undefined ? "GET" : "POST",
+        headers: {"Content-Type": "application/json"},
+        body: body === undefined ? undefined : JSON.stringify(body),
+    });
+    return response.json();
+}
+
+document.getElementById("submit").addEventListener("click", async () => {
+    const button = document.getElementById("submit");
+    const panel = document.getElementById("result");
+    button.disabled = true;
+    submissions += 1;
+    panel.textContent = "Judging...";
+    const result = await call("/submit", {code: text});
+    button.disabled = false;
+    if (result.passed) {
+        panel.textContent = "Submission #" + submissions + "\\nAccepted\\n" +
+            result.passed_tests + "/" + result.total_tests + " test cases passed";
+        const next = document.createElement("button");
+        next.id = "next";
+        next.className = "ring-offset-background focus-visible:ring-ring inline-flex justify-center h-10";
+        next.textContent = "Next question";
+        next.addEventListener("click", async () => {
+            next.disabled = true;
+            showProblem(await call("/next", {}));
+        });
+        document.getElementById("workspace").appendChild(next);
+    } else {
+        panel.textContent = "Submission #" + submissions + "\\n" + result.verdict +
+            "\\nTest case #" + (result.failed_test + 1) + "\\n" +
+            result.passed_tests + "/" + result.total_tests + " test cases passed";
+    }
+});
+
+// Static fixtures (fixture_page) carry their problem instead of asking the server
+const initial = document.getElementById("initial-state");
+(initial ? Promise.resolve(JSON.parse(initial.textContent)) : call("")).then(showProblem);
+</script>
+</body></html>
+"""
+
+
+def fixture_page(problem):
+    """Return a game room page for one combined.json problem that needs no server.
+
+    Submitting does not work on it, everything the bot does before that does.
+    """
+    state = {
+        "status": "playing",
+        "index": 0,
+        "total": 1,
+        "title": problem["title"],
+        "difficulty": problem.get("difficulty", ""),
+        "description": problem.get("description", ""),
+        "boilerplate": problem.get("boilerplate", ""),
+    }
+    initial = (
+        '<script type="application/json" id="initial-state">'
+        + json.dumps(state).replace("</", "<\\/")
+        + "</script>\n"
+    )
+    return GAME_PAGE.replace("<script>", initial + "<script>", 1)
+
+
+def verdict(error):
+    """Map an OfflineJudge error to the verdict line the game room shows."""
+    if error is None:
+        return "Accepted"
+    if error.startswith("Wrong Answer"):
+        return "Wrong Answer"
+    if error.startswith("Timeout") or "Time Limit" in error:
+        return "Time Limit Exceeded"
+    if error.startswith("MemoryError"):
+        return "Memory Limit Exceeded"
+    if error.startswith(("SyntaxError", "IndentationError", "TabError")):
+        return f"Syntax Error: {error}"
+    return f"Runtime Error: {error}"
+
+
+class MockBeatCode:
+    def __init__(
+        self,
+        combined_filename="combined.json",
+        solutions_filename="solutions.json",
+        problems_per_game=3,
+        seed=0,
+        latency=0.0,
+        judge_delay=0.0,
+    ):
+        """
+        Local stand-in for beatcode.dev: login, unranked games and a judge.
+
+        :param combined_filename: The JSON file with the problems and their hidden tests.
+        :param solutions_filename: Only problems with a known solution are dealt.
+        :param problems_per_game: Problems to solve before "You won!" shows.
+        :param seed: Seed of the problem order; game n always gets the same problems.
+        :param latency: Seconds added to every request, for a deterministic network.
+        :param judge_delay: Minimum seconds a submission takes to be judged.
+        """
+        self.judge = OfflineJudge(combined_filename, solutions_filename)
+        self.problems_per_game = problems_per_game
+        self.seed = seed
+        self.latency = latency
+        self.judge_delay = judge_delay
+        self.sessions = set()
+        self.games = {}
+        self.lock = threading.Lock()
+
+        problems = self.judge.load_problems()
+        self.titles = sorted(
+            title for title in SolutionStore(solutions_filename).titles() if title in problems
+        )
+        if not self.titles:
+            raise ValueError("No problem of combined.json has a solution to play with.")
+
+    def login(self):
+        """Start a session and return its token."""
+        token = secrets.token_hex(16)
+        with self.lock:
+            self.sessions.add(token)
+        return token
+
+    def new_game(self):
+        """Deal the problems of a new game and return its id."""
+        with self.lock:
+            number = len(self.games)
+            rng = random.Random(self.seed + number)
+            count = min(self.problems_per_game, len(self.titles))
+            game_id = f"{number}-{secrets.token_hex(4)}"
+            self.games[game_id] = {
+                "problems": rng.sample(self.titles, count),
+                "index": 0,
+                "passed": False,
+            }
+        return game_id
+
+    def game_state(self, game_id):
+        """Return what the game room shows: the current problem or the won banner."""
+        game = self.games[game_id]
+        total = len(game["problems"])
+        if game["index"] >= total:
+            return {"status": "won", "total": total}
+        problem = self.judge.load_problems()[game["problems"][game["index"]]]
+        return {
+            "status": "playing",
+            "index": game["index"],
+            "total": total,
+            "title": problem["title"],
+            "difficulty": problem.get("difficulty", ""),
+            "description": problem.get("description", ""),
+            "boilerplate": problem.get("boilerplate", ""),
+        }
+
+    def submit(self, game_id, code):
+        """Judge `code` on the hidden tests of the current problem."""
+        started = time.perf_counter()
+        game = self.games[game_id]
+        if game["index"] >= len(game["problems"]):
+            return {"passed": False, "verdict": "Game over", "failed_test": 0}
+        problem = self.judge.load_problems()[game["problems"][game["index"]]]
+        tests = [
+            list(test)
+            for test in zip(problem["hidden_test_cases"], problem["hidden_test_results"])
+        ]
+        result = self.judge.run_solution(code, problem, tests)
+        result["verdict"] = verdict(result["error"])
+        if result["failed_test"] is None:
+            result["failed_test"] = 0
+        game["passed"] = game["passed"] or result["passed"]
+
+        remaining = self.judge_delay - (time.perf_counter() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+        return result
+
+    def next_problem(self, game_id):
+        """Move on once the current problem has been passed."""
+        game = self.games[game_id]
+        if game["passed"]:
+            game["index"] += 1
+            game["passed"] = False
+        return self.game_state(game_id)
+
+    def serve(self, host="127.0.0.1", port=8000):
+        """Serve until Ctrl+C."""
+        server = ThreadingHTTPServer((host, port), MockBeatCodeHandler)
+        server.mock = self
+        print(f"Mock BeatCode on http://{host}:{port} ({len(self.titles)} playable problems).")
+        print(f"Point the bot at it with BEATCODE_URL=http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("Stopping the mock server.")
+        finally:
+            server.server_close()
+
+
+class MockBeatCodeHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def mock(self):
+        return self.server.mock
+
+    def logged_in(self):
+        for cookie in self.headers.get("Cookie", "").split(";"):
+            name, _, value = cookie.strip().partition("=")
+            if name == "session" and value in self.mock.sessions:
+                return True
+        return False
+
+    def send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def redirect(self, location, headers=None):
+        self.send(302, "", headers=dict(headers or {}, Location=location))
+
+    def send_json(self, value):
+        self.send(200, json.dumps(value), "application/json")
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+
+    def do_GET(self):
+        if self.mock.latency:
+            time.sleep(self.mock.latency)
+        path = self.path.split("?")[0].rstrip("/") or "/"
+
+        if path == "/login":
+            return self.send(200, LOGIN_PAGE)
+        if not self.logged_in():
+            return self.redirect("/login")
+        if path in ("/", "/home"):
+            return self.send(200, HOME_PAGE)
+        if path == "/solo/unranked":
+            return self.redirect(f"/game/{self.mock.new_game()}")
+
+        parts = path.strip("/").split("/")
+        if parts[0] == "game" and len(parts) == 2 and parts[1] in self.mock.games:
+            return self.send(200, GAME_PAGE)
+        if parts[:2] == ["api", "game"] and len(parts) == 3 and parts[2] in self.mock.games:
+            return self.send_json(self.mock.game_state(parts[2]))
+        self.send(404, "Not found")
+
+    def do_POST(self):
+        if self.mock.latency:
+            time.sleep(self.mock.latency)
+        path = self.path.split("?")[0].rstrip("/")
+        body = self.read_body()
+
+        if path == "/login":
+            form = parse_qs(body)
+            if not form.get("username") or not form.get("password"):
+                return self.send(200, LOGIN_PAGE)
+            return self.redirect(
+                "/home",
+                {"Set-Cookie": f"session={self.mock.login()}; Path=/; HttpOnly"},
+            )
+        if not self.logged_in():
+            return self.send(401, "Not logged in")
+
+        parts = path.strip("/").split("/")
+        if parts[:2] != ["api", "game"] or len(parts) != 4 or parts[2] not in self.mock.games:
+            return self.send(404, "Not found")
+        if parts[3] == "submit":
+            return self.send_json(self.mock.submit(parts[2], json.loads(body)["code"]))
+        if parts[3] == "next":
+            return self.send_json(self.mock.next_problem(parts[2]))
+        self.send(404, "Not found")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for beatcode.dev.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--problems", type=int, default=3, help="problems per game")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--judge-delay", type=float, default=0.0, help="minimum judge time in seconds")
+    args = parser.parse_args()
+
+    MockBeatCode(
+        problems_per_game=args.problems,
+        seed=args.seed,
+        latency=args.latency,
+        judge_delay=args.judge_delay,
+    ).serve(args.host, args.port)
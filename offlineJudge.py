@@ -0,0 +1,275 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+
+from solutionStore import SolutionStore
+from problemCatalog import ProblemCatalog
+
+try:
+    import resource  # POSIX only, used to cap the sandboxed interpreter
+except ImportError:
+    resource = None
+
+
+# Runs inside the sandboxed interpreter. Reads {code, compare_func, tests} from
+# stdin and writes one result per test case to stdout as JSON.
+HARNESS = """
+import io
+import sys
+import json
+import time
+import signal
+
+payload = json.load(sys.stdin)
+test_timeout = payload.get("test_timeout")
+
+
+def on_timeout(signum, frame):
+    raise TimeoutError("Time Limit Exceeded")
+
+
+if test_timeout and hasattr(signal, "setitimer"):
+    signal.signal(signal.SIGALRM, on_timeout)
+else:
+    test_timeout = None
+stdout = sys.stdout
+sys.stdout = io.StringIO()  # Solutions are allowed to print
+
+namespace = {}
+exec(
+    "from typing import *\\n"
+    "from collections import *\\n"
+    "from heapq import *\\n"
+    "from bisect import *\\n"
+    "import sys, math, heapq, bisect, itertools, functools, re, string\\n",
+    namespace,
+)
+results = []
+try:
+    exec(payload["code"], namespace)
+    exec("def compare(result, expected):\\n    " + payload["compare_func"], namespace)
+except Exception as e:
+    results.append({"passed": False, "runtime": 0, "error": f"{type(e).__name__}: {e}"})
+else:
+    for case, expected in payload["tests"]:
+        started = time.perf_counter()
+        try:
+            if test_timeout:
+                signal.setitimer(signal.ITIMER_REAL, test_timeout)
+            try:
+                result = eval("solution." + case, namespace, {"solution": namespace["Solution"]()})
+            finally:
+                if test_timeout:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            runtime = time.perf_counter() - started
+            passed = bool(namespace["compare"](result, expected))
+            error = None if passed else "Wrong Answer"
+        except Exception as e:
+            runtime = time.perf_counter() - started
+            passed, error = False, f"{type(e).__name__}: {e}"
+        results.append({"passed": passed, "runtime": runtime, "error": error})
+
+stdout.write(json.dumps(results))
+"""
+
+
+class OfflineJudge:
+    def __init__(
+        self,
+        combined_filename="combined.json",
+        solutions_filename="solutions.json",
+        timeout=10,
+        test_timeout=None,
+        memory_limit_mb=None,
+    ):
+        """
+        Judge solutions.json against the test cases shipped in combined.json.
+
+        :param combined_filename: The JSON file with the problems and their tests.
+        :param solutions_filename: The JSON file containing the answer key.
+        :param timeout: Wall-clock seconds allowed for one solution over all its tests.
+        :param test_timeout: Wall-clock seconds allowed for a single test case (POSIX only).
+        :param memory_limit_mb: Address space cap of the sandboxed interpreter (POSIX only).
+        """
+        self.combined_filename = combined_filename
+        self.store = SolutionStore(solutions_filename)
+        self.timeout = timeout
+        self.test_timeout = test_timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.problems = None
+        self.results = {}
+
+    def load_problems(self):
+        """Open combined.json as a title -> problem mapping that parses problems on demand."""
+        if self.problems is None:
+            self.problems = ProblemCatalog(self.combined_filename)
+        return self.problems
+
+    def build_tests(self, problem):
+        """Pair every sample and hidden test case with its expected result.
+
+        Args:
+            problem (dict): a problem from combined.json
+
+        Returns:
+            list: [test case, expected result] pairs
+        """
+        cases = problem.get("sample_test_cases", []) + problem.get(
+            "hidden_test_cases", []
+        )
+        expected = problem.get("sample_test_results", []) + problem.get(
+            "hidden_test_results", []
+        )
+        return [list(test) for test in zip(cases, expected)]
+
+    def sandbox_limits(self):
+        """Cap CPU time and memory of the child interpreter (POSIX only)."""
+        cpu_seconds = int(self.timeout) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+        if self.memory_limit_mb:
+            memory_bytes = self.memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+    def run_solution(self, code, problem, tests=None):
+        """Run one solution against a problem's tests in a sandboxed subprocess.
+
+        Args:
+            code (str): the solution code
+            problem (dict): a problem from combined.json
+            tests (list, optional): [test case, expected] pairs. Defaults to all of them.
+
+        Returns:
+            dict: passed flag, passed/total test counts, runtime and first error
+        """
+        if tests is None:
+            tests = self.build_tests(problem)
+        payload = json.dumps(
+            {
+                "code": code,
+                "compare_func": problem["compare_func"],
+                "tests": tests,
+                "test_timeout": self.test_timeout,
+            }
+        )
+
+        started = time.perf_counter()
+        try:
+            with tempfile.TemporaryDirectory() as sandbox_dir:
+                completed = subprocess.run(
+                    [sys.executable, "-I", "-c", HARNESS],
+                    input=payload,
+                    capture_output=True,
+                    text=True,
+                    timeout=self.timeout,
+                    cwd=sandbox_dir,
+                    env={"PATH": os.environ.get("PATH", "")},
+                    preexec_fn=self.sandbox_limits if resource else None,
+                )
+            test_results = json.loads(completed.stdout)
+        except subprocess.TimeoutExpired:
+            test_results = [{"passed": False, "runtime": self.timeout, "error": "Timeout"}]
+        except Exception as e:
+            test_results = [{"passed": False, "runtime": 0, "error": f"Crashed: {e}"}]
+        wall_time = time.perf_counter() - started
+
+        passed_tests = sum(1 for result in test_results if result["passed"])
+        failed = [i for i, result in enumerate(test_results) if not result["passed"]]
+        return {
+            "passed": passed_tests == len(tests) and len(test_results) == len(tests),
+            "passed_tests": passed_tests,
+            "total_tests": len(tests),
+            "runtime": sum(result["runtime"] for result in test_results),
+            "wall_time": wall_time,
+            "failed_test": failed[0] if failed else None,
+            "error": test_results[failed[0]]["error"] if failed else None,
+        }
+
+    def judge_problem(self, problem_name):
+        """Judge every solution of one problem.
+
+        Args:
+            problem_name (str): the problem title
+
+        Returns:
+            list: one result per solution, in solution store order
+        """
+        problem = self.load_problems().get(problem_name)
+        if problem is None:
+            print(f"No tests found for {problem_name}, skipping.")
+            return []
+
+        results = []
+        for index in range(self.store.count_solutions(problem_name)):
+            result = self.run_solution(
+                self.store.get_solution(problem_name, index), problem
+            )
+            result["index"] = index
+            results.append(result)
+            status = "passed" if result["passed"] else f"failed ({result['error']})"
+            print(f"{problem_name} [{index}]: {status} in {result['runtime']:.3f}s")
+
+        self.results[problem_name] = results
+        return results
+
+    def judge_all(self):
+        """Judge every problem in the solution store."""
+        for problem_name in self.store.titles():
+            self.judge_problem(problem_name)
+        return self.results
+
+    def save_results(self, filename="judge_results.json", compact=False):
+        """Write the judge results to a JSON file.
+
+        Args:
+            filename (str, optional): output file. Defaults to "judge_results.json".
+            compact (bool, optional): drop indentation and whitespace. Defaults to False.
+        """
+        with open(filename, "w") as file:
+            if compact:
+                json.dump(self.results, file, separators=(",", ":"))
+            else:
+                json.dump(self.results, file, indent=4)
+        print(f"Judge results saved to {filename}.")
+
+
+def load_judge_results(filename="judge_results.json"):
+    """Load judge results, returning an empty dictionary if there are none yet."""
+    if not os.path.exists(filename) or os.stat(filename).st_size == 0:
+        return {}
+    with open(filename, "r") as file:
+        return json.load(file)
+
+
+def passing_order(judge_results, problem_name, solution_count):
+    """Order solution indices: known-passing fastest first, then unjudged, then failing.
+
+    Args:
+        judge_results (dict): results as written by OfflineJudge.save_results
+        problem_name (str): the problem title
+        solution_count (int): how many solutions the problem has
+
+    Returns:
+        list: solution indices in the order they should be tried
+    """
+    by_index = {
+        result["index"]: result for result in judge_results.get(problem_name, [])
+    }
+
+    def sort_key(index):
+        result = by_index.get(index)
+        if result is None:
+            return (1, 0, index)
+        if result["passed"]:
+            return (0, result["runtime"], index)
+        return (2, -result["passed_tests"], index)
+
+    return sorted(range(solution_count), key=sort_key)
+
+
+if __name__ == "__main__":
+    judge = OfflineJudge()
+    judge.judge_all()
+    judge.save_results()
@@ -0,0 +1,192 @@
+import time
+import sqlite3
+import threading
+
+from solutionDatabase import code_hash
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outcomes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    problem TEXT NOT NULL,
+    code_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    submits INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outcomes_problem ON outcomes (problem, code_hash, id);
+"""
+
+
+class OutcomeLog:
+    def __init__(self, filename="outcomes.db", skip_after=2):
+        """
+        Remember how every solution fared in real games and try the best ones first.
+
+        Outcomes are keyed by a hash of the code, not by its position in
+        solutions.json, so re-scraping or re-exporting the file keeps the history
+        attached to the right solution.
+
+        :param filename: The SQLite database file, shared by every bot on the machine.
+        :param skip_after: Consecutive rejections after which a solution is skipped.
+            Timeouts do not count, the judge may just have been slow.
+        """
+        self.filename = filename
+        self.skip_after = skip_after
+        self.local = threading.local()
+        with self.connection() as connection:
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(outcomes)")]
+            if columns and "code_hash" not in columns:
+                # Rows keyed by solution index may point at other code by now
+                print("Moving the outcomes keyed by solution index to outcomes_by_index.")
+                connection.execute("DROP INDEX IF EXISTS outcomes_problem")
+                connection.execute("ALTER TABLE outcomes RENAME TO outcomes_by_index")
+            connection.executescript(SCHEMA)
+
+    def connection(self):
+        """Return this thread's connection (sqlite3 connections are not shared)."""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.filename, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    def record(self, problem_name, code, status, submits, seconds):
+        """Log one solution tried in a game.
+
+        Args:
+            problem_name (str): the problem title
+            code (str): the solution code, as the solution store returns it
+            status (str): "passed", "failed" (rejected by the judge), "timeout" or
+                "editor" (still failing after the editor was repaired)
+            submits (int): submissions made with this solution
+            seconds (float): from fetching the solution to the verdict
+        """
+        try:
+            with self.connection() as connection:
+                connection.execute(
+                    "INSERT INTO outcomes (problem, code_hash, status, submits, seconds, played_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (problem_name, code_hash(code), status, submits, seconds, time.time()),
+                )
+        except sqlite3.Error as e:
+            print(f"Failed to record the outcome of {problem_name}. Error: {e}")
+
+    def history(self, problem_name):
+        """Return {code hash: stats} for a problem.
+
+        Stats are attempts (verdicts on the solution itself), passes, submits, mean
+        seconds to pass and the current streak (positive for passes, negative for
+        rejections). Timeouts and editor failures only add to the submits.
+        """
+        rows = self.connection().execute(
+            "SELECT code_hash, status, submits, seconds FROM outcomes "
+            "WHERE problem = ? ORDER BY id",
+            (problem_name,),
+        ).fetchall()
+
+        history = {}
+        for solution_hash, status, submits, seconds in rows:
+            stats = history.setdefault(
+                solution_hash,
+                {"attempts": 0, "passes": 0, "submits": 0, "pass_seconds": 0.0, "streak": 0},
+            )
+            stats["submits"] += submits
+            if status == "passed":
+                stats["attempts"] += 1
+                stats["passes"] += 1
+                stats["pass_seconds"] += seconds
+                stats["streak"] = stats["streak"] + 1 if stats["streak"] > 0 else 1
+            elif status == "failed":
+                stats["attempts"] += 1
+                stats["streak"] = stats["streak"] - 1 if stats["streak"] < 0 else -1
+
+        for stats in history.values():
+            # Laplace smoothing: an untried solution counts as 50/50
+            stats["success_rate"] = (stats["passes"] + 1) / (stats["attempts"] + 2)
+            stats["mean_seconds"] = (
+                stats["pass_seconds"] / stats["passes"] if stats["passes"] else None
+            )
+        return history
+
+    def reorder(self, problem_name, order, codes):
+        """Order candidates by past success rate, then by expected time to pass.
+
+        Untried solutions keep their place from `order` between proven and failing
+        ones, and solutions rejected `skip_after` times in a row are dropped unless
+        that would leave nothing to try.
+
+        Args:
+            problem_name (str): the problem title
+            order (list): solution indices from the ranking or the offline judge
+            codes (dict): solution index -> code, for every index in `order`
+
+        Returns:
+            list: solution indices in the order they should be tried
+        """
+        try:
+            history = self.history(problem_name)
+        except sqlite3.Error as e:
+            print(f"Failed to read the outcome log. Error: {e}")
+            return order
+        if not history:
+            return order
+        hashes = {index: code_hash(codes[index]) for index in order}
+
+        def sort_key(index):
+            stats = history.get(hashes[index])
+            if stats is None:
+                return (-0.5, 0)
+            return (-stats["success_rate"], stats["mean_seconds"] or 0)
+
+        ranked = sorted(order, key=sort_key)
+        playable = [
+            index
+            for index in ranked
+            if hashes[index] not in history
+            or history[hashes[index]]["streak"] > -self.skip_after
+        ]
+        return playable or ranked
+
+    def summary(self):
+        """Return per-problem submits and time to pass over every logged game.
+
+        Attempts count verdicts on the solution itself, as in history().
+        """
+        rows = self.connection().execute(
+            "SELECT problem, SUM(status IN ('passed', 'failed')), SUM(submits), "
+            "SUM(status = 'passed'), AVG(CASE WHEN status = 'passed' THEN seconds END) "
+            "FROM outcomes GROUP BY problem ORDER BY problem"
+        ).fetchall()
+        return {
+            problem: {
+                "attempts": attempts,
+                "submits": submits,
+                "passes": passes,
+                "mean_seconds_to_pass": mean_seconds,
+            }
+            for problem, attempts, submits, passes, mean_seconds in rows
+        }
+
+    def close(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+
+if __name__ == "__main__":
+    summary = OutcomeLog().summary()
+    passes = sum(stats["passes"] for stats in summary.values())
+    submits = sum(stats["submits"] for stats in summary.values())
+    for problem, stats in summary.items():
+        mean = stats["mean_seconds_to_pass"]
+        print(
+            f"{problem}: {stats['passes']}/{stats['attempts']} passed, {stats['submits']} submits"
+            + (f", {mean:.1f}s to pass" if mean is not None else "")
+        )
+    if passes:
+        print(f"{submits / passes:.2f} submits per passed problem over {len(summary)} problems.")
@@ -0,0 +1,108 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+
+# Resolves as soon as the predicate returns something truthy, re-checking on every
+# DOM mutation instead of polling from Python. Resolves with null on timeout.
+MUTATION_WAIT_SCRIPT = """
+const timeoutMs = arguments[arguments.length - 2];
+const done = arguments[arguments.length - 1];
+const args = Array.prototype.slice.call(arguments, 0, arguments.length - 2);
+const predicate = () => {
+    /*PREDICATE*/
+};
+
+let value = predicate();
+if (value) return done(value);
+
+const observer = new MutationObserver(() => {
+    value = predicate();
+    if (value) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(value);
+    }
+});
+observer.observe(document.documentElement, {
+    childList: true,
+    subtree: true,
+    characterData: true,
+    attributes: true,
+});
+const timer = setTimeout(() => {
+    observer.disconnect();
+    done(null);
+}, timeoutMs);
+"""
+
+
+class PageWaits:
+    def __init__(self, driver, timeout=30, poll_frequency=0.1):
+        """
+        Block on concrete page conditions instead of fixed sleeps.
+
+        :param driver: The Selenium WebDriver.
+        :param timeout: Default maximum wait in seconds.
+        :param poll_frequency: Seconds between checks for the Python-side waits.
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+
+    def until(self, condition, timeout=None):
+        """WebDriverWait with a short polling interval."""
+        return WebDriverWait(
+            self.driver, timeout or self.timeout, poll_frequency=self.poll_frequency
+        ).until(condition)
+
+    def url_contains(self, fragment, timeout=None):
+        """Wait until the current URL contains `fragment`."""
+        return self.until(EC.url_contains(fragment), timeout)
+
+    def url_changes(self, url, timeout=None):
+        """Wait until the current URL is no longer `url`."""
+        return self.until(EC.url_changes(url), timeout)
+
+    def element_present(self, selector, timeout=None):
+        """Wait until an element matching the CSS selector is in the DOM."""
+        return self.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, selector)), timeout
+        )
+
+    def new_window(self, known_handles, url_fragment=None, timeout=None):
+        """Wait until a window that is not in `known_handles` opens.
+
+        With `url_fragment`, the current window navigating to a URL containing it
+        also ends the wait.
+
+        Returns:
+            str: the handle of the new window, or of the current one if it navigated
+        """
+
+        def opened(driver):
+            new_handles = set(driver.window_handles) - set(known_handles)
+            if new_handles:
+                return new_handles.pop()
+            if url_fragment and url_fragment in driver.current_url:
+                return driver.current_window_handle
+            return False
+
+        return self.until(opened, timeout)
+
+    def mutation(self, predicate, *args, timeout=None):
+        """Wait in the browser with a MutationObserver until the JS predicate holds.
+
+        Args:
+            predicate (str): JS function body reading `args` and returning a truthy value when done
+            *args: values passed to the predicate as `args`
+            timeout (float, optional): seconds to wait. Defaults to self.timeout.
+
+        Returns:
+            the predicate's value, or None on timeout
+        """
+        timeout = timeout or self.timeout
+        # The async script has to outlive the observer's own timer
+        self.driver.set_script_timeout(timeout + 5)
+        script = MUTATION_WAIT_SCRIPT.replace("/*PREDICATE*/", predicate)
+        return self.driver.execute_async_script(script, *args, timeout * 1000)
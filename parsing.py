@@ -1,9 +1,5 @@
-import json
+from problemCatalog import ProblemCatalog
 
-# load the json file
-with open('combined.json') as f:
-    data = json.load(f)
-    
-for problem in data:
-    print(problem['title'])
-    
+# Titles come from the index, no problem has to be parsed
+for title in ProblemCatalog('combined.json').titles():
+    print(title)
@@ -0,0 +1,239 @@
+import os
+import re
+import json
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE problems (
+    position INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    slug TEXT,
+    source TEXT,
+    difficulty TEXT,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+"""
+
+SEPARATOR = re.compile(r"[\s,]*")
+
+
+def source_slug(source):
+    """Return the problem slug of a LeetCode URL, e.g. "two-sum"."""
+    if not source:
+        return None
+    parts = [part for part in urlparse(source).path.split("/") if part]
+    if "problems" in parts and parts.index("problems") + 1 < len(parts):
+        return parts[parts.index("problems") + 1]
+    return parts[-1] if parts else None
+
+
+class ProblemCatalog:
+    def __init__(self, combined_filename="combined.json", index_filename=None, cache_size=32):
+        """
+        Title -> problem mapping over combined.json that only parses what is used.
+
+        A small SQLite index (title, slug, source, difficulty and the byte range of
+        every problem) is built once and rebuilt when combined.json changes. Heavy
+        fields (description, tests, boilerplate) are read from their byte range on
+        demand, so opening the catalog does not parse the problem set.
+
+        :param combined_filename: The JSON file with the problems.
+        :param index_filename: The SQLite index. Defaults to <combined>.index.db.
+        :param cache_size: How many fully loaded problems are kept in memory.
+        """
+        self.combined_filename = combined_filename
+        self.index_filename = index_filename or (
+            os.path.splitext(combined_filename)[0] + ".index.db"
+        )
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.entries = self.load_index()
+
+    def source_signature(self):
+        """Size and mtime of combined.json; the index is stale when they change."""
+        stat = os.stat(self.combined_filename)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def load_index(self):
+        """Read the index into a title -> entry dictionary, rebuilding it if stale."""
+        signature = self.source_signature()
+        if os.path.exists(self.index_filename):
+            try:
+                connection = sqlite3.connect(self.index_filename)
+                try:
+                    stored = connection.execute(
+                        "SELECT value FROM meta WHERE key = 'signature'"
+                    ).fetchone()
+                    if stored and stored[0] == signature:
+                        rows = connection.execute(
+                            "SELECT title, slug, source, difficulty, offset, length "
+                            "FROM problems ORDER BY position"
+                        ).fetchall()
+                        return self.entries_from_rows(rows)
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                print(f"Failed to read the problem index, rebuilding it. Error: {e}")
+        return self.entries_from_rows(self.build_index(signature))
+
+    def entries_from_rows(self, rows):
+        return {
+            row[0]: {
+                "title": row[0],
+                "slug": row[1],
+                "source": row[2],
+                "difficulty": row[3],
+                "offset": row[4],
+                "length": row[5],
+            }
+            for row in rows
+        }
+
+    def build_index(self, signature=None):
+        """Scan combined.json once and write the byte range of every problem.
+
+        Returns:
+            list: the index rows, in file order
+        """
+        with open(self.combined_filename, "rb") as file:
+            text = file.read().decode("utf-8")
+
+        decoder = json.JSONDecoder()
+        rows = []
+        position = text.index("[") + 1
+        # Character positions -> byte offsets, advanced incrementally
+        char_cursor = byte_cursor = 0
+        while True:
+            position = SEPARATOR.match(text, position).end()
+            if position >= len(text) or text[position] == "]":
+                break
+            problem, end = decoder.raw_decode(text, position)
+            byte_cursor += len(text[char_cursor:position].encode("utf-8"))
+            length = len(text[position:end].encode("utf-8"))
+            rows.append(
+                (
+                    problem["title"],
+                    source_slug(problem.get("source")),
+                    problem.get("source"),
+                    problem.get("difficulty"),
+                    byte_cursor,
+                    length,
+                )
+            )
+            byte_cursor += length
+            char_cursor = position = end
+
+        # Written next to the target and swapped in, so readers never see half an index
+        directory = os.path.dirname(os.path.abspath(self.index_filename))
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(descriptor)
+        try:
+            connection = sqlite3.connect(temporary)
+            with connection:
+                connection.executescript(SCHEMA)
+                connection.executemany(
+                    "INSERT INTO problems (title, slug, source, difficulty, offset, length) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                connection.execute(
+                    "INSERT INTO meta (key, value) VALUES ('signature', ?)",
+                    (signature or self.source_signature(),),
+                )
+            connection.close()
+            os.replace(temporary, self.index_filename)
+        except Exception as e:
+            print(f"Failed to save the problem index. Error: {e}")
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        print(f"Indexed {len(rows)} problems of {self.combined_filename}.")
+        return rows
+
+    def entry(self, title):
+        """Return the light fields of a problem (title, slug, source, difficulty), or None."""
+        return self.entries.get(title)
+
+    def titles(self):
+        return list(self.entries)
+
+    def sources(self):
+        """Return the title -> source URL map without parsing any problem."""
+        return {title: entry["source"] for title, entry in self.entries.items()}
+
+    def load(self, title):
+        """Parse one full problem from its byte range (kept in a small LRU cache)."""
+        if title in self.cache:
+            self.cache.move_to_end(title)
+            return self.cache[title]
+
+        entry = self.entries[title]
+        with open(self.combined_filename, "rb") as file:
+            file.seek(entry["offset"])
+            problem = json.loads(file.read(entry["length"]))
+
+        self.cache[title] = problem
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return problem
+
+    def field(self, title, name, default=None):
+        """Return one field of a problem, parsing it only if it is a heavy one."""
+        entry = self.entries.get(title)
+        if entry is None:
+            return default
+        if name in ("title", "slug", "source", "difficulty"):
+            return entry[name]
+        return self.load(title).get(name, default)
+
+    # Read-only mapping interface, so the catalog can stand in for the old dictionary
+
+    def __contains__(self, title):
+        return title in self.entries
+
+    def __getitem__(self, title):
+        return self.load(title)
+
+    def get(self, title, default=None):
+        return self.load(title) if title in self.entries else default
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self):
+        return self.entries.keys()
+
+
+if __name__ == "__main__":
+    import time
+
+    started = time.perf_counter()
+    catalog = ProblemCatalog()
+    opened = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for title in catalog:
+        catalog.field(title, "source")
+    lookups = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with open(catalog.combined_filename, "r") as file:
+        {problem["title"]: problem["source"] for problem in json.load(file)}
+    full_load = time.perf_counter() - started
+
+    print(
+        f"{len(catalog)} problems: catalog opened in {opened * 1000:.1f}ms, "
+        f"{len(catalog)} source lookups in {lookups * 1000:.2f}ms, "
+        f"full json.load in {full_load * 1000:.1f}ms."
+    )
@@ -0,0 +1,219 @@
+import os
+import time
+import queue
+import argparse
+import threading
+from dotenv import load_dotenv
+
+from driverFactory import DriverFactory
+from testingChromedriver import LeetCodeScraper
+from solutionDatabase import SolutionDatabase
+from problemCatalog import ProblemCatalog
+
+
+class ScraperPool:
+    def __init__(
+        self,
+        driver_path,
+        workers=4,
+        retries=2,
+        headless=True,
+        wait_time=10,
+        filename="solutions.json",
+        database=None,
+        profile_commands=False,
+        force_export=False,
+    ):
+        """
+        Scrape LeetCode solutions with several browser sessions sharing one work queue.
+
+        :param driver_path: Path to the ChromeDriver.
+        :param workers: Number of Chrome sessions running at the same time.
+        :param retries: Extra attempts per work item before it is given up.
+        :param headless: Run the browsers without a window.
+        :param wait_time: Maximum wait time for elements to load.
+        :param filename: The JSON file the scraped solutions are saved to.
+        :param database: Optional SolutionDatabase. Workers then write to it concurrently
+            and `filename` is exported once at the end.
+        :param profile_commands: Time every WebDriver command and print the top call sites.
+        :param force_export: Export the database even if it would shift solution indices.
+        """
+        self.driver_path = driver_path
+        self.workers = workers
+        self.retries = retries
+        self.headless = headless
+        self.wait_time = wait_time
+        self.filename = filename
+        self.database = database
+        self.force_export = force_export
+        self.work = queue.Queue()
+        self.stop_event = threading.Event()
+        self.save_lock = threading.Lock()
+        self.stats = {"saved": 0, "failed": 0}
+        # Scraping only needs the DOM, so skip images and fonts
+        self.driver_factory = DriverFactory(
+            driver_path,
+            headless=headless,
+            block_images=True,
+            block_fonts=True,
+            page_load_strategy="eager",
+            profile_commands=profile_commands,
+        )
+
+    def create_scraper(self):
+        """Start one browser session."""
+        return LeetCodeScraper(
+            self.driver_path,
+            wait_time=self.wait_time,
+            database=self.database,
+            driver_factory=self.driver_factory,
+        )
+
+    def fill_queue(self, combined_filename="combined.json", link_indices=(1, 2)):
+        """Queue one work item per problem source URL and solution link.
+
+        :param combined_filename: The JSON file with the problems and their source URLs.
+        :param link_indices: Which solution links of each problem to scrape.
+        """
+        for title, source in ProblemCatalog(combined_filename).sources().items():
+            for link in link_indices:
+                self.work.put((title, source, link))
+        print(f"Queued {self.work.qsize()} scraping jobs.")
+
+    def worker(self, worker_id):
+        """Take jobs off the queue until it is empty or the pool is stopping."""
+        scraper = None
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    problem_name, url, link = self.work.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    for attempt in range(self.retries + 1):
+                        if self.stop_event.is_set():
+                            break
+                        if scraper is None:
+                            scraper = self.create_scraper()
+
+                        code = scraper.run_scrapper(
+                            url,
+                            link,
+                            scraper.extract_code_type_bg3,
+                            scraper.extract_code_type_fontMenlo,
+                        )
+                        if code and scraper.is_python_code(code):
+                            if self.database is not None:
+                                # The database handles concurrent writers itself
+                                scraper.save_solution_to_file(
+                                    self.filename, problem_name, "Python", code, url
+                                )
+                            else:
+                                with self.save_lock:
+                                    scraper.save_solution_to_file(
+                                        self.filename, problem_name, "Python", code, url
+                                    )
+                            with self.save_lock:
+                                self.stats["saved"] += 1
+                            break
+
+                        print(
+                            f"[worker {worker_id}] Attempt {attempt + 1} failed for {problem_name} (link {link})."
+                        )
+                        # Start from a fresh browser in case the session went bad
+                        scraper.close()
+                        scraper = None
+                    else:
+                        with self.save_lock:
+                            self.stats["failed"] += 1
+                except Exception as e:
+                    print(f"[worker {worker_id}] Error on {problem_name}: {e}")
+                    with self.save_lock:
+                        self.stats["failed"] += 1
+                    if scraper is not None:
+                        try:
+                            scraper.close()
+                        except Exception:
+                            pass
+                    scraper = None
+                finally:
+                    self.work.task_done()
+        finally:
+            if scraper is not None:
+                try:
+                    scraper.close()
+                except Exception as e:
+                    print(f"[worker {worker_id}] Failed to close the browser: {e}")
+
+    def run(self):
+        """Run every worker until the queue is drained. Ctrl+C stops gracefully."""
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=self.worker, args=(worker_id,), daemon=True)
+            for worker_id in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            print("Stopping: workers finish their current job and close their browsers.")
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+
+        if self.database is not None:
+            self.database.export_json(self.filename, force=self.force_export)
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"Saved {self.stats['saved']} solutions, {self.stats['failed']} jobs failed in {elapsed:.1f}s."
+        )
+        if self.driver_factory.profiler is not None:
+            self.driver_factory.profiler.report()
+            self.driver_factory.profiler.save()
+        return self.stats
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(
+        description="Refresh solutions.json with a pool of headless Chrome sessions."
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--headful", action="store_true")
+    parser.add_argument(
+        "--profile", action="store_true", help="time every WebDriver command"
+    )
+    parser.add_argument(
+        "--database", help="SQLite file to collect into before exporting solutions.json"
+    )
+    parser.add_argument(
+        "--force-export",
+        action="store_true",
+        help="export the database even if existing solutions would change index",
+    )
+    args = parser.parse_args()
+
+    database = None
+    if args.database:
+        database = SolutionDatabase(args.database)
+        database.import_json("solutions.json")
+
+    pool = ScraperPool(
+        os.getenv("CHROME_DRIVER_PATH"),
+        workers=args.workers,
+        retries=args.retries,
+        headless=not args.headful,
+        database=database,
+        profile_commands=args.profile,
+        force_export=args.force_export,
+    )
+    pool.fill_queue()
+    pool.run()
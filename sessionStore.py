@@ -0,0 +1,107 @@
+import os
+import json
+import time
+from urllib.parse import urlparse
+
+
+class SessionStore:
+    def __init__(self, filename="session.json", max_age=7 * 24 * 3600):
+        """
+        Save and restore the logged-in browser state (cookies + localStorage).
+
+        :param filename: The JSON file holding the session. Keep it out of git.
+        :param max_age: Seconds after which a saved session is not restored anymore.
+        """
+        self.filename = filename
+        self.max_age = max_age
+
+    def save(self, driver):
+        """Save the cookies and localStorage of the page currently open in `driver`."""
+        session = {
+            "saved_at": time.time(),
+            "hostname": urlparse(driver.current_url).hostname,
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(
+                "const items = {};"
+                "for (let i = 0; i < localStorage.length; i++) {"
+                "    const key = localStorage.key(i);"
+                "    items[key] = localStorage.getItem(key);"
+                "}"
+                "return items;"
+            ),
+        }
+        with open(self.filename, "w") as file:
+            json.dump(session, file)
+        print(f"Session saved to {self.filename}.")
+
+    def load(self):
+        """Return the saved session, or None if there is none or it is too old."""
+        if not os.path.exists(self.filename) or os.stat(self.filename).st_size == 0:
+            return None
+        with open(self.filename, "r") as file:
+            session = json.load(file)
+        if time.time() - session.get("saved_at", 0) > self.max_age:
+            print("Saved session is too old, logging in again.")
+            return None
+        return session
+
+    def restore(self, driver):
+        """Inject the saved session before the first navigation.
+
+        Cookies go in through CDP Network.setCookies and localStorage through a
+        script that runs before the page's own scripts, so no page has to be
+        loaded first just to get onto the right origin.
+
+        Returns:
+            bool: True if a session was restored
+        """
+        session = self.load()
+        if session is None:
+            return False
+
+        cookies = []
+        for cookie in session["cookies"]:
+            cdp_cookie = {
+                "name": cookie["name"],
+                "value": cookie["value"],
+                "domain": cookie["domain"],
+                "path": cookie.get("path", "/"),
+                "secure": cookie.get("secure", False),
+                "httpOnly": cookie.get("httpOnly", False),
+            }
+            if "expiry" in cookie:
+                cdp_cookie["expires"] = cookie["expiry"]
+            if "sameSite" in cookie:
+                cdp_cookie["sameSite"] = cookie["sameSite"]
+            cookies.append(cdp_cookie)
+
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            if session["local_storage"]:
+                driver.execute_cdp_cmd(
+                    "Page.addScriptToEvaluateOnNewDocument",
+                    {
+                        "source": "if (location.hostname === %s) {"
+                        "    const items = %s;"
+                        "    for (const key in items) {"
+                        "        if (localStorage.getItem(key) === null) localStorage.setItem(key, items[key]);"
+                        "    }"
+                        "}"
+                        % (
+                            json.dumps(session.get("hostname")),
+                            json.dumps(session["local_storage"]),
+                        )
+                    },
+                )
+        except Exception as e:
+            print(f"Failed to restore the session. Error: {e}")
+            return False
+
+        print(f"Restored {len(cookies)} cookies from {self.filename}.")
+        return True
+
+    def clear(self):
+        """Forget the saved session, e.g. after it was rejected."""
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
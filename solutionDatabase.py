@@ -0,0 +1,241 @@
+import os
+import json
+import sqlite3
+import hashlib
+import tempfile
+import threading
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    name TEXT PRIMARY KEY,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS solutions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    problem TEXT NOT NULL REFERENCES problems(name),
+    language TEXT NOT NULL,
+    code TEXT NOT NULL,
+    code_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS solutions_code ON solutions (problem, language, code_hash);
+"""
+
+
+def code_hash(code):
+    """Hash a code string; equal hashes mean the same code whatever its index."""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+class SolutionDatabase:
+    def __init__(self, filename="solutions.db"):
+        """
+        SQLite storage for scraped solutions.
+
+        New saves are single INSERT statements deduplicated by a content hash
+        index, every write is its own transaction and WAL mode lets several
+        scrapers write at the same time. Imported solutions.json rows are kept as
+        they are, duplicates included, so an export reproduces the file.
+
+        :param filename: The SQLite database file.
+        """
+        self.filename = filename
+        self.local = threading.local()
+        with self.connection() as connection:
+            table = connection.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'solutions'"
+            ).fetchone()
+            if table and "UNIQUE" in table[0]:
+                # Older databases refused the duplicates solutions.json already has
+                connection.executescript(
+                    "ALTER TABLE solutions RENAME TO solutions_unique;"
+                    + SCHEMA
+                    + "INSERT INTO solutions SELECT id, problem, language, code, code_hash "
+                    "FROM solutions_unique ORDER BY id;"
+                    "DROP TABLE solutions_unique;"
+                )
+            connection.executescript(SCHEMA)
+
+    def connection(self):
+        """Return this thread's connection (sqlite3 connections are not shared)."""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.filename, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    def add_solution(self, problem_name, language, code, source=None):
+        """Save a solution unless the same one is already stored.
+
+        Args:
+            problem_name (str): the problem title
+            language (str): language of the solution
+            code (str | list): the solution code, stored exactly as given
+            source (str, optional): the LeetCode source URL of the problem
+
+        Returns:
+            bool: True if the solution was new
+        """
+        stored_code = json.dumps(code)
+        with self.connection() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO problems (name, source) VALUES (?, ?)",
+                (problem_name, source),
+            )
+            if source is not None:
+                connection.execute(
+                    "UPDATE problems SET source = ? WHERE name = ? AND source IS NULL",
+                    (source, problem_name),
+                )
+            stored_hash = code_hash(stored_code)
+            # One statement, so concurrent scrapers cannot both insert the same code
+            cursor = connection.execute(
+                "INSERT INTO solutions (problem, language, code, code_hash) "
+                "SELECT ?, ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM solutions "
+                "WHERE problem = ? AND language = ? AND code_hash = ?)",
+                (problem_name, language, stored_code, stored_hash)
+                + (problem_name, language, stored_hash),
+            )
+        return cursor.rowcount == 1
+
+    def count_solutions(self, problem_name):
+        """Return how many solutions are stored for a problem."""
+        row = (
+            self.connection()
+            .execute("SELECT COUNT(*) FROM solutions WHERE problem = ?", (problem_name,))
+            .fetchone()
+        )
+        return row[0]
+
+    def import_json(self, filename="solutions.json"):
+        """Load an existing solutions.json into the database, row for row.
+
+        Duplicates in the file are kept, since judge_results.json and
+        solution_ranking.json refer to solutions by position. A solution that the
+        database already holds at the same position of its problem is skipped, so
+        importing the same file again adds nothing.
+
+        Returns:
+            int: the number of new solutions
+        """
+        with open(filename, "r") as file:
+            data = json.load(file)
+
+        added = 0
+        for problem_name, problem in data.items():
+            source = problem.get("source")
+            with self.connection() as connection:
+                connection.execute(
+                    "INSERT OR IGNORE INTO problems (name, source) VALUES (?, ?)",
+                    (problem_name, source),
+                )
+                stored = connection.execute(
+                    "SELECT language, code_hash FROM solutions WHERE problem = ? ORDER BY id",
+                    (problem_name,),
+                ).fetchall()
+                for position, solution in enumerate(problem.get("solutions", [])):
+                    stored_code = json.dumps(solution["code"])
+                    row = (solution["language"], code_hash(stored_code))
+                    if position < len(stored) and tuple(stored[position]) == row:
+                        continue
+                    connection.execute(
+                        "INSERT INTO solutions (problem, language, code, code_hash) "
+                        "VALUES (?, ?, ?, ?)",
+                        (problem_name, solution["language"], stored_code, row[1]),
+                    )
+                    added += 1
+        print(f"Imported {added} new solutions from {filename}.")
+        return added
+
+    def to_dict(self):
+        """Build the solutions.json layout from the database."""
+        connection = self.connection()
+        data = {}
+        for name, source in connection.execute(
+            "SELECT name, source FROM problems ORDER BY rowid"
+        ):
+            data[name] = {"solutions": []}
+            if source is not None:
+                data[name]["source"] = source
+
+        for problem, language, code in connection.execute(
+            "SELECT problem, language, code FROM solutions ORDER BY id"
+        ):
+            data[problem]["solutions"].append(
+                {"language": language, "code": json.loads(code)}
+            )
+        return data
+
+    def moved_problems(self, filename, data):
+        """Return the problems of `filename` whose solutions would change position.
+
+        judge_results.json and solution_ranking.json refer to solutions by their
+        index, so an export may only append solutions, never drop or reorder them.
+        """
+        if not os.path.exists(filename):
+            return []
+        with open(filename, "r") as file:
+            existing = json.load(file)
+
+        moved = []
+        for problem_name, problem in existing.items():
+            old = [(s["language"], s["code"]) for s in problem.get("solutions", [])]
+            new = [
+                (s["language"], s["code"])
+                for s in data.get(problem_name, {}).get("solutions", [])
+            ]
+            if new[: len(old)] != old:
+                moved.append(problem_name)
+        return moved
+
+    def export_json(self, filename="solutions.json", force=False):
+        """Atomically write the database out in today's solutions.json layout.
+
+        Args:
+            filename (str, optional): output file. Defaults to "solutions.json".
+            force (bool, optional): export even if existing solutions would change
+                index (e.g. duplicates in the old file were merged). Defaults to False.
+
+        Returns:
+            bool: True if the file was written
+        """
+        data = self.to_dict()
+        moved = self.moved_problems(filename, data)
+        if moved:
+            print(
+                f"{len(moved)} problems would lose or reorder solutions, e.g. {moved[0]!r}, "
+                "which shifts the indices judge_results.json and solution_ranking.json use."
+            )
+            if not force:
+                print(f"Not exporting to {filename}; export with force=True to accept this.")
+                return False
+
+        if os.path.exists(filename):
+            mode = os.stat(filename).st_mode & 0o777
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+
+        directory = os.path.dirname(os.path.abspath(filename))
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w") as file:
+                json.dump(data, file, indent=4)
+            # mkstemp creates the file 0600; keep the permissions of the file it replaces
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, filename)
+        except Exception:
+            os.remove(temp_path)
+            raise
+        print(f"Exported solutions to {filename}.")
+        return True
+
+    def close(self):
+        """Close this thread's connection."""
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
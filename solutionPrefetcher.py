@@ -0,0 +1,122 @@
+from keystrokePlanner import KeystrokePlanner
+from problemCatalog import ProblemCatalog
+
+
+class SolutionPrefetcher:
+    def __init__(
+        self,
+        automation,
+        filename="solutions.json",
+        combined_filename="combined.json",
+        typo_chance=0.15,
+        typing_speed_short=0.05,
+        typing_speed_long=0.3,
+        short_line_threshold=30,
+    ):
+        """
+        Prepare the next candidates while the judge is busy with a submission.
+
+        The game loop calls prefetch() right after clicking submit, so ranking the
+        candidates, splitting their code and planning the keystrokes overlaps with
+        the judge instead of delaying the next attempt. Everything runs on the
+        calling thread; the prepared candidates are cached until they are taken.
+
+        :param automation: The BeatCodeAutomation whose store and ranking are used.
+        :param filename: The JSON file containing the answer key.
+        :param combined_filename: The problem set, whose order predicts the next problem.
+        :param typo_chance: KeystrokePlanner settings, the input_code_into_editor defaults.
+        :param typing_speed_short: See typo_chance.
+        :param typing_speed_long: See typo_chance.
+        :param short_line_threshold: See typo_chance.
+        """
+        self.automation = automation
+        self.filename = filename
+        self.combined_filename = combined_filename
+        self.planner_options = (
+            typo_chance,
+            typing_speed_short,
+            typing_speed_long,
+            short_line_threshold,
+        )
+        self.prepared = {}
+        self.catalog = None
+        self.stats = {"hits": 0, "misses": 0, "wasted": 0}
+
+    def prefetch(self, title, position=0, order=None):
+        """Prepare one candidate of a resolved title unless it is already cached.
+
+        Args:
+            title (str): the solutions.json title
+            position (int, optional): the position in the solution order. Defaults to 0.
+            order (list, optional): the problem's solution order if it is already
+                known, e.g. the one fixed for the problem being played
+        """
+        if not title or (title, position) in self.prepared:
+            return
+        try:
+            if order is None:
+                order = self.automation.solution_order(title, self.filename)
+            if position >= len(order):
+                return
+            store = self.automation.get_solution_store(self.filename)
+            code = store.get_solution(title, order[position])
+            lines = self.automation.process_raw_solution(code)
+            plan = KeystrokePlanner(
+                *self.planner_options, seed=self.automation.typing_seed
+            ).plan_code(lines)
+        except Exception as e:
+            print(f"Failed to prefetch the solution. Error: {e}")
+            return
+        self.prepared[(title, position)] = {
+            "title": title,
+            "order": order,
+            "index": order[position],
+            "code": code,
+            "lines": lines,
+            "plan": plan,
+        }
+
+    def predict_next(self, title):
+        """Guess the problem after `title` from the combined.json order, or None."""
+        if self.catalog is None:
+            self.catalog = ProblemCatalog(self.combined_filename)
+        titles = self.catalog.titles()
+        if title not in self.catalog:
+            return None
+        position = titles.index(title) + 1
+        return titles[position] if position < len(titles) else None
+
+    def order_for(self, title):
+        """Return the solution order prepared for `title`, or None."""
+        prepared = self.prepared.get((title, 0))
+        return prepared["order"] if prepared is not None else None
+
+    def take(self, title, position, code):
+        """Return the prepared candidate if it matches `code`, otherwise None.
+
+        Args:
+            title (str): the resolved title of the problem
+            position (int): the position in the solution order that was fetched
+            code (str): the solution code fetch_problem_solution returned
+
+        Returns:
+            dict: title, order, index, code, lines and the keystroke plan, or None
+        """
+        prepared = self.prepared.pop((title, position), None)
+        if prepared is None or prepared["code"] != code:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return prepared
+
+    def discard(self):
+        """Forget candidates that were not used (the prediction was wrong)."""
+        self.stats["wasted"] += len(self.prepared)
+        self.prepared.clear()
+
+    def report(self):
+        self.discard()
+        print(
+            f"Prefetch: {self.stats['hits']} used, {self.stats['misses']} missed, "
+            f"{self.stats['wasted']} discarded."
+        )
@@ -0,0 +1,127 @@
+import os
+import json
+
+from offlineJudge import OfflineJudge
+
+
+class SolutionRanker:
+    def __init__(
+        self,
+        judge=None,
+        seconds_per_char=0.2,
+        runtime_weight=100,
+        repeat=3,
+    ):
+        """
+        Rank the candidates of each problem by how fast they finish the game.
+
+        :param judge: The OfflineJudge used to time the candidates.
+        :param seconds_per_char: Expected typing time per character (humanlike defaults).
+        :param runtime_weight: Seconds of score per second of hidden test runtime,
+            so slow candidates are pushed away from server-side time limits.
+        :param repeat: How many times each candidate is timed; the fastest run counts.
+        """
+        self.judge = judge or OfflineJudge()
+        self.seconds_per_char = seconds_per_char
+        self.runtime_weight = runtime_weight
+        self.repeat = repeat
+        self.ranking = {}
+
+    def typed_characters(self, code):
+        """Count the characters the bot types for a solution (blank lines are skipped)."""
+        lines = [line for line in code.split("\n") if line != "" and not line.isspace()]
+        return sum(len(line) + 1 for line in lines)
+
+    def benchmark_problem(self, problem_name):
+        """Time and score every candidate of one problem on the hidden tests.
+
+        Args:
+            problem_name (str): the problem title
+
+        Returns:
+            list: per-candidate scores, best (lowest) first; failing candidates last
+        """
+        problem = self.judge.load_problems().get(problem_name)
+        if problem is None:
+            print(f"No tests found for {problem_name}, skipping.")
+            return []
+        tests = [
+            list(test)
+            for test in zip(problem["hidden_test_cases"], problem["hidden_test_results"])
+        ]
+
+        scores = []
+        store = self.judge.store
+        for index in range(store.count_solutions(problem_name)):
+            code = store.get_solution(problem_name, index)
+            runs = [
+                self.judge.run_solution(code, problem, tests) for _ in range(self.repeat)
+            ]
+            passed = all(run["passed"] for run in runs)
+            runtime = min(run["runtime"] for run in runs)
+            characters = self.typed_characters(code)
+            scores.append(
+                {
+                    "index": index,
+                    "passed": passed,
+                    "runtime": runtime,
+                    "characters": characters,
+                    "score": characters * self.seconds_per_char
+                    + runtime * self.runtime_weight,
+                }
+            )
+
+        scores.sort(key=lambda score: (not score["passed"], score["score"]))
+        self.ranking[problem_name] = scores
+        print(
+            f"{problem_name}: "
+            + ", ".join(
+                f"[{score['index']}] {score['score']:.1f}{'' if score['passed'] else ' (failed)'}"
+                for score in scores
+            )
+        )
+        return scores
+
+    def rank_all(self):
+        """Benchmark every problem in the solution store."""
+        for problem_name in self.judge.store.titles():
+            self.benchmark_problem(problem_name)
+        return self.ranking
+
+    def save_ranking(self, filename="solution_ranking.json"):
+        """Write the ranking to a JSON file."""
+        with open(filename, "w") as file:
+            json.dump(self.ranking, file, indent=4)
+        print(f"Solution ranking saved to {filename}.")
+
+
+def load_ranking(filename="solution_ranking.json"):
+    """Load the solution ranking, returning an empty dictionary if there is none yet."""
+    if not os.path.exists(filename) or os.stat(filename).st_size == 0:
+        return {}
+    with open(filename, "r") as file:
+        return json.load(file)
+
+
+def ranked_order(ranking, problem_name, solution_count):
+    """Return the ranked solution indices of a problem, or None if it was not ranked.
+
+    Indices that no longer exist are dropped and new, unranked ones go between
+    the passing and the failing candidates, so a stale ranking never hides a solution.
+    """
+    if problem_name not in ranking:
+        return None
+    scores = [
+        score for score in ranking[problem_name] if score["index"] < solution_count
+    ]
+    ranked = {score["index"] for score in scores}
+    passing = [score["index"] for score in scores if score["passed"]]
+    failing = [score["index"] for score in scores if not score["passed"]]
+    unranked = [index for index in range(solution_count) if index not in ranked]
+    return passing + unranked + failing
+
+
+if __name__ == "__main__":
+    ranker = SolutionRanker()
+    ranker.rank_all()
+    ranker.save_ranking()
@@ -0,0 +1,105 @@
+import os
+import json
+
+from titleIndex import TitleIndex
+from problemCatalog import source_slug
+
+
+class SolutionStore:
+    def __init__(self, filename="solutions.json"):
+        """
+        Keep solutions.json in memory as a title -> solutions index.
+
+        :param filename: The JSON file containing the answer key.
+        """
+        self.filename = filename
+        self.mtime = None
+        self.index = {}
+        self.sources = {}
+        self.title_index = TitleIndex([])
+
+    def normalise_code(self, code):
+        """Normalise the different shapes of `code` found in solutions.json.
+
+        Args:
+            code (str | list): a code string, or a list wrapping code strings
+
+        Returns:
+            str: the code as one string, empty if there is no usable code
+        """
+        if isinstance(code, list):
+            code = "\n".join(part for part in code if isinstance(part, str))
+        if not isinstance(code, str) or code.strip() == "":
+            return ""
+        return code
+
+    def load(self):
+        """
+        Parse the JSON file and rebuild the index. Empty solutions are dropped
+        so every index in the store points at code that can be typed.
+        """
+        with open(self.filename, "r") as file:
+            data = json.load(file)
+
+        index = {}
+        sources = {}
+        for problem_name, problem in data.items():
+            codes = []
+            for solution in problem.get("solutions", []):
+                code = self.normalise_code(solution.get("code", ""))
+                if code:
+                    codes.append(code)
+            index[problem_name] = codes
+            if "source" in problem:
+                sources[problem_name] = problem["source"]
+
+        self.index = index
+        self.sources = sources
+        self.title_index = TitleIndex(
+            index, {source_slug(source): name for name, source in sources.items()}
+        )
+        print(f"Loaded {len(index)} problems from {self.filename}.")
+
+    def reload_if_changed(self):
+        """Reload the file only when its modification time has changed."""
+        mtime = os.stat(self.filename).st_mtime_ns
+        if mtime != self.mtime:
+            self.load()
+            self.mtime = mtime
+
+    def get_solution(self, problem_name, solution_idx=0):
+        """Get the solution code at `solution_idx` for a problem.
+
+        Args:
+            problem_name (str): the problem title
+            solution_idx (int, optional): index of the solution. Defaults to 0.
+
+        Returns:
+            str: the solution code
+        """
+        self.reload_if_changed()
+        return self.index[problem_name][solution_idx]
+
+    def count_solutions(self, problem_name):
+        """Return how many usable solutions a problem has (0 if unknown)."""
+        self.reload_if_changed()
+        return len(self.index.get(problem_name, []))
+
+    def get_source(self, problem_name):
+        """Return the LeetCode source URL of a problem, or None."""
+        self.reload_if_changed()
+        return self.sources.get(problem_name)
+
+    def resolve_title(self, title):
+        """Map a title as shown in the game (any case, spacing or numbering) to its key.
+
+        Returns:
+            str: the solutions.json title, None if no problem is close enough
+        """
+        self.reload_if_changed()
+        return self.title_index.resolve(title)
+
+    def titles(self):
+        """Return every problem title in the store."""
+        self.reload_if_changed()
+        return list(self.index.keys())
@@ -9,17 +9,31 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from problemCatalog import ProblemCatalog
+
 
 class LeetCodeScraper:
-    def __init__(self, driver_path, wait_time=10):
+    def __init__(
+        self,
+        driver_path,
+        wait_time=10,
+        database=None,
+        driver_factory=None,
+    ):
         """
         Initialize the LeetCodeScraper with WebDriver.
 
         :param driver_path: Path to the ChromeDriver.
         :param wait_time: Maximum wait time for elements to load.
+        :param database: Optional SolutionDatabase; saves go there instead of rewriting the JSON file.
+        :param driver_factory: Optional DriverFactory; takes precedence over driver_path.
         """
-        self.driver = webdriver.Chrome(service=Service(driver_path))
+        if driver_factory is not None:
+            self.driver = driver_factory.create()
+        else:
+            self.driver = webdriver.Chrome(service=Service(driver_path))
         self.wait = WebDriverWait(self.driver, wait_time)
+        self.database = database
 
     def load_json_file(self, filename):
         """
@@ -266,7 +280,7 @@ class LeetCodeScraper:
             print(f"An error occurred: {e}")
             return ""
 
-    def save_solution_to_file(self, filename, problem_name, language, code):
+    def save_solution_to_file(self, filename, problem_name, language, code, source=None):
         """
         Save the problem name and solution to a JSON file.
 
@@ -274,7 +288,15 @@ class LeetCodeScraper:
         :param problem_name: Name of the problem.
         :param language: Language of the solution.
         :param code: The solution code.
+        :param source: The LeetCode URL the solution was scraped from.
         """
+        if self.database is not None:
+            if self.database.add_solution(problem_name, language, code, source):
+                print(f"Solution saved to {problem_name} in {language}.")
+            else:
+                print("Solution already exists, skipping.")
+            return
+
         data = self.load_json_file(filename)
 
         if problem_name in data:
@@ -288,6 +310,8 @@ class LeetCodeScraper:
         else:
             # Add a new problem with its solution
             data[problem_name] = {"solutions": [{"language": language, "code": code}]}
+        if source is not None:
+            data[problem_name].setdefault("source", source)
 
         with open(filename, "w") as file:
             json.dump(data, file, indent=4)
@@ -298,11 +322,7 @@ class LeetCodeScraper:
         Validate the extracted code to ensure it's written in Python.
         """
         data = self.load_json_file("solutions.json")
-        combined_data = self.load_json_file("combined.json")
-        processed_combined_data = {}
-
-        for obj in combined_data:
-            processed_combined_data[obj["title"]] = obj["source"]
+        processed_combined_data = ProblemCatalog("combined.json").sources()
 
         for problem_name, solutions in data.items():
             valid_solution = []
@@ -357,14 +377,21 @@ class LeetCodeScraper:
                         self.extract_code_type_fontMenlo_all,
                     )
                     self.save_solution_to_file(
-                        "solutions.json", problem_name, "Python", code
+                        "solutions.json",
+                        problem_name,
+                        "Python",
+                        code,
+                        data[problem_name]["source"],
                     )
 
-                    # Reload the updated data to check the number of solutions again
-                    data = self.load_json_file("solutions.json")
-
                     # Check if the problem now has at least 2 solutions
-                    if len(data[problem_name]["solutions"]) >= 2:
+                    if self.database is not None:
+                        solution_count = self.database.count_solutions(problem_name)
+                    else:
+                        # Reload the updated data to check the number of solutions again
+                        data = self.load_json_file("solutions.json")
+                        solution_count = len(data[problem_name]["solutions"])
+                    if solution_count >= 2:
                         print(f"Problem '{problem_name}' has enough solutions.")
                         break
 
@@ -375,11 +402,7 @@ class LeetCodeScraper:
         :param filename: The JSON file to read from.
         """
         data = self.load_json_file("solutions.json")
-        combined_data = self.load_json_file("combined.json")
-        processed_combined_data = {}
-
-        for obj in combined_data:
-            processed_combined_data[obj["title"]] = obj["source"]
+        processed_combined_data = ProblemCatalog("combined.json").sources()
 
         for problem_name in data.keys():
             data[problem_name]["source"] = processed_combined_data[problem_name]
@@ -0,0 +1,121 @@
+import os
+import time
+import shutil
+import asyncio
+import tempfile
+import threading
+import subprocess
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("websockets")
+pytest.importorskip("selenium")
+pytest.importorskip("pyperclip")
+
+import asyncBeatCode
+from asyncBeatCode import AsyncBeatCodeTab, CDPConnection
+from autoNavAndFill import BeatCodeAutomation
+from mockBeatCode import MockBeatCode, MockBeatCodeHandler
+from outcomeLog import OutcomeLog
+from solutionStore import SolutionStore
+
+CHROME_NAMES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+
+def find_chrome():
+    if os.getenv("CHROME_BINARY"):
+        return os.getenv("CHROME_BINARY")
+    for name in CHROME_NAMES:
+        if shutil.which(name):
+            return shutil.which(name)
+    return None
+
+
+def passing_titles(mock, automation, count):
+    """Problems whose first solution in the play order passes the hidden tests."""
+    store = automation.get_solution_store()
+    titles = []
+    for title in mock.titles:
+        problem = mock.judge.load_problems()[title]
+        tests = [
+            list(test)
+            for test in zip(problem["hidden_test_cases"], problem["hidden_test_results"])
+        ]
+        first = automation.solution_order(title)[0]
+        if mock.judge.run_solution(store.get_solution(title, first), problem, tests)["passed"]:
+            titles.append(title)
+        if len(titles) == count:
+            return titles
+    pytest.skip("Not enough problems with a passing first solution.")
+
+
+@pytest.fixture
+def automation(tmp_path):
+    automation = BeatCodeAutomation(solution_store=SolutionStore())
+    automation.outcome_log = OutcomeLog(str(tmp_path / "outcomes.db"))
+    return automation
+
+
+@pytest.fixture
+def mock_server(automation):
+    mock = MockBeatCode(problems_per_game=2)
+    mock.titles = passing_titles(mock, automation, 2)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockBeatCodeHandler)
+    server.mock = mock
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield mock, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def chrome():
+    binary = find_chrome()
+    if binary is None:
+        pytest.skip("No Chrome binary (set CHROME_BINARY).")
+    profile = tempfile.mkdtemp()
+    process = subprocess.Popen(
+        [binary, "--headless=new", "--remote-debugging-port=0", f"--user-data-dir={profile}"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    port_file = os.path.join(profile, "DevToolsActivePort")
+    deadline = time.time() + 30
+    while not os.path.exists(port_file) and time.time() < deadline:
+        time.sleep(0.1)
+    try:
+        with open(port_file) as file:
+            yield f"127.0.0.1:{file.readline().strip()}"
+    finally:
+        process.terminate()
+        process.wait()
+        shutil.rmtree(profile, ignore_errors=True)
+
+
+def test_passes_two_problems_in_a_row(mock_server, chrome, automation, monkeypatch):
+    mock, base_url = mock_server
+    monkeypatch.setattr(asyncBeatCode, "UNRANKED_URL", base_url + "/solo/unranked")
+    monkeypatch.setattr(asyncBeatCode, "GAME_URL", base_url + "/game")
+
+    async def play():
+        connection = await CDPConnection.from_debugger_address(chrome)
+        try:
+            tab = await AsyncBeatCodeTab.open(connection)
+            await tab.send(
+                "Network.setCookie",
+                {"name": "session", "value": mock.login(), "url": base_url},
+            )
+            return await asyncio.wait_for(
+                tab.play_unranked_game(automation, input_mode="block"), 120
+            )
+        finally:
+            await connection.close()
+
+    stats = asyncio.run(play())
+
+    # The "Next question" button has the same text on both problems
+    assert stats["problems"] == 2
+    assert stats["won"]
+    assert stats["submissions"] == 2
@@ -0,0 +1,97 @@
+import pytest
+
+from outcomeLog import OutcomeLog
+from solutionDatabase import code_hash
+
+PROBLEM = "Two Sum"
+CODES = {0: "code a", 1: "code b", 2: "code c", 3: "code d"}
+ORDER = [0, 1, 2, 3]
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = OutcomeLog(str(tmp_path / "outcomes.db"))
+    yield log
+    log.close()
+
+
+def test_untried_problem_keeps_the_order(log):
+    assert log.reorder(PROBLEM, ORDER, CODES) == ORDER
+
+
+def test_proven_before_untried_before_failing(log):
+    log.record(PROBLEM, CODES[0], "failed", 1, 3.0)
+    log.record(PROBLEM, CODES[2], "passed", 1, 4.0)
+
+    assert log.reorder(PROBLEM, ORDER, CODES) == [2, 1, 3, 0]
+
+
+def test_faster_of_two_proven_solutions_first(log):
+    log.record(PROBLEM, CODES[1], "passed", 1, 9.0)
+    log.record(PROBLEM, CODES[3], "passed", 1, 2.0)
+
+    assert log.reorder(PROBLEM, ORDER, CODES)[:2] == [3, 1]
+
+
+def test_skipped_after_two_rejections_in_a_row(log):
+    log.record(PROBLEM, CODES[0], "failed", 1, 3.0)
+    assert 0 in log.reorder(PROBLEM, ORDER, CODES)
+
+    log.record(PROBLEM, CODES[0], "failed", 1, 3.0)
+    assert log.reorder(PROBLEM, ORDER, CODES) == [1, 2, 3]
+
+
+def test_pass_breaks_the_rejection_streak(log):
+    log.record(PROBLEM, CODES[0], "failed", 1, 3.0)
+    log.record(PROBLEM, CODES[0], "passed", 1, 3.0)
+    log.record(PROBLEM, CODES[0], "failed", 1, 3.0)
+
+    assert log.history(PROBLEM)[code_hash(CODES[0])]["streak"] == -1
+    assert 0 in log.reorder(PROBLEM, ORDER, CODES)
+
+
+def test_rejected_solutions_kept_when_nothing_is_left(log):
+    for index in (0, 1):
+        log.record(PROBLEM, CODES[index], "failed", 1, 3.0)
+        log.record(PROBLEM, CODES[index], "failed", 1, 3.0)
+
+    assert log.reorder(PROBLEM, [0, 1], CODES) == [0, 1]
+
+
+def test_timeouts_and_editor_failures_not_counted(log):
+    for status in ("timeout", "editor", "timeout", "editor"):
+        log.record(PROBLEM, CODES[0], status, 2, 30.0)
+
+    stats = log.history(PROBLEM)[code_hash(CODES[0])]
+    assert stats["attempts"] == 0
+    assert stats["streak"] == 0
+    assert stats["submits"] == 8
+    assert stats["success_rate"] == 0.5
+    assert log.reorder(PROBLEM, ORDER, CODES) == ORDER
+
+
+def test_timeouts_do_not_break_a_rejection_streak(log):
+    log.record(PROBLEM, CODES[0], "failed", 1, 3.0)
+    log.record(PROBLEM, CODES[0], "timeout", 1, 30.0)
+    log.record(PROBLEM, CODES[0], "failed", 1, 3.0)
+
+    assert 0 not in log.reorder(PROBLEM, ORDER, CODES)
+
+
+def test_history_follows_the_code_not_the_index(log):
+    log.record(PROBLEM, CODES[0], "passed", 1, 3.0)
+    moved = {0: CODES[1], 1: CODES[0]}
+
+    assert log.reorder(PROBLEM, [0, 1], moved) == [1, 0]
+
+
+def test_summary_counts_verdicts_as_attempts(log):
+    log.record(PROBLEM, CODES[0], "failed", 1, 3.0)
+    log.record(PROBLEM, CODES[1], "timeout", 3, 30.0)
+    log.record(PROBLEM, CODES[2], "passed", 2, 5.0)
+
+    summary = log.summary()[PROBLEM]
+    assert summary["attempts"] == 2
+    assert summary["submits"] == 6
+    assert summary["passes"] == 1
+    assert summary["mean_seconds_to_pass"] == 5.0
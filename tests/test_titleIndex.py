@@ -0,0 +1,80 @@
+import pytest
+
+from titleIndex import TitleIndex, normalise_title
+
+TITLES = [
+    "Two Sum",
+    "Jump Game",
+    "Jump Game II",
+    "Best Time to Buy and Sell Stock",
+    "Pow(x, n)",
+]
+
+
+@pytest.fixture
+def index():
+    return TitleIndex(TITLES, {"powx-n": "Pow(x, n)"})
+
+
+def test_normalise_title():
+    assert normalise_title("1. Two  Sum") == "two sum"
+    assert normalise_title("two-sum") == "two sum"
+    assert normalise_title("Pow(x, n)") == "pow x n"
+
+
+@pytest.mark.parametrize(
+    "shown, title",
+    [
+        ("Two Sum", "Two Sum"),
+        ("two sum", "Two Sum"),
+        ("1. Two Sum", "Two Sum"),
+        ("  Jump   Game II ", "Jump Game II"),
+        ("Best Time to Buy & Sell Stock", "Best Time to Buy and Sell Stock"),
+    ],
+)
+def test_exact_match_ignores_case_spacing_and_numbering(index, shown, title):
+    assert index.resolve(shown) == title
+
+
+@pytest.mark.parametrize(
+    "slug, title",
+    [
+        ("two-sum", "Two Sum"),
+        ("jump-game-ii", "Jump Game II"),
+        ("powx-n", "Pow(x, n)"),
+    ],
+)
+def test_slug_matches(index, slug, title):
+    assert index.resolve(slug) == title
+
+
+@pytest.mark.parametrize(
+    "shown, title",
+    [
+        ("Two Summ", "Two Sum"),
+        ("Best Time to Buy and Sell Stocks", "Best Time to Buy and Sell Stock"),
+        ("Jump Gmae II", "Jump Game II"),
+    ],
+)
+def test_near_miss_resolves(index, shown, title):
+    assert index.resolve(shown) == title
+
+
+@pytest.mark.parametrize(
+    "shown",
+    [
+        "Jump Game III",
+        "Jump Game IV",
+        "Three Sum",
+        "Merge Intervals",
+        "",
+        None,
+    ],
+)
+def test_must_not_match(index, shown):
+    assert index.resolve(shown) is None
+
+
+def test_numbered_sequel_does_not_fall_back_to_the_original():
+    index = TitleIndex(["Jump Game"])
+    assert index.resolve("Jump Game II") is None
@@ -0,0 +1,98 @@
+import re
+import difflib
+import unicodedata
+
+
+LEADING_NUMBER = re.compile(r"^\s*(?:#\s*)?\d+\s*[.):\-]\s*")
+NON_WORD = re.compile(r"[^a-z0-9]+")
+# "Jump Game" and "Jump Game II" are different problems, however close the strings are
+NUMERAL_TOKEN = re.compile(r"^(?:[ivx]+|\d+)$")
+
+
+def normalise_title(title):
+    """Normalise a problem title or slug for lookups.
+
+    "1. Two  Sum", "two-sum" and "Two Sum" all become "two sum".
+
+    Args:
+        title (str): a title as shown by beatcode.dev, LeetCode or solutions.json
+
+    Returns:
+        str: lowercase words separated by single spaces
+    """
+    title = unicodedata.normalize("NFKD", title)
+    title = "".join(char for char in title if not unicodedata.combining(char))
+    title = LEADING_NUMBER.sub("", title).lower().replace("&", " and ")
+    return NON_WORD.sub(" ", title).strip()
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def numerals(key):
+    return {token for token in key.split() if NUMERAL_TOKEN.match(token)}
+
+
+class TitleIndex:
+    def __init__(self, titles, aliases=None, cutoff=0.85):
+        """
+        Resolve problem titles that differ in case, spacing, punctuation or numbering.
+
+        :param titles: The canonical titles (e.g. the solutions.json keys).
+        :param aliases: Extra alias -> title pairs, e.g. LeetCode slugs.
+        :param cutoff: Minimum similarity (0-1) of a fuzzy match.
+        """
+        self.cutoff = cutoff
+        self.keys = {}
+        self.compact_keys = {}
+        for title in titles:
+            self.add(title, title)
+        for alias, title in (aliases or {}).items():
+            if alias:
+                self.add(alias, title)
+
+        self.grams = {}
+        for key in self.keys:
+            for gram in trigrams(key):
+                self.grams.setdefault(gram, set()).add(key)
+        self.cache = {}
+
+    def add(self, name, title):
+        key = normalise_title(name)
+        if key:
+            self.keys.setdefault(key, title)
+            self.compact_keys.setdefault(key.replace(" ", ""), title)
+
+    def fuzzy(self, key):
+        """Best trigram candidate that is also close by edit distance, or None."""
+        key_grams = trigrams(key)
+        overlap = {}
+        for gram in key_grams:
+            for candidate in self.grams.get(gram, ()):
+                overlap[candidate] = overlap.get(candidate, 0) + 1
+
+        best, best_score = None, self.cutoff
+        # Only the few closest by trigram overlap get the slower edit-distance check
+        for candidate in sorted(overlap, key=overlap.get, reverse=True)[:5]:
+            if numerals(candidate) != numerals(key):
+                continue
+            score = difflib.SequenceMatcher(None, key, candidate).ratio()
+            if score >= best_score:
+                best, best_score = candidate, score
+        return self.keys[best] if best else None
+
+    def resolve(self, title):
+        """Return the canonical title for `title`, or None if nothing is close enough."""
+        if title in self.cache:
+            return self.cache[title]
+
+        key = normalise_title(title or "")
+        resolved = (
+            self.keys.get(key)
+            or self.compact_keys.get(key.replace(" ", ""))
+            or (self.fuzzy(key) if key else None)
+        )
+        self.cache[title] = resolved
+        return resolved